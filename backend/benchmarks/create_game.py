@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""Measure how many games can be created per second under concurrency.
+
+Usage:
+    DATABASE_URI=mysql://... python benchmarks/create_game.py [GAMES] [TASKS]
+"""
+import asyncio
+import sys
+import time
+from os import getenv
+
+from tortoise import Tortoise
+
+from jeopardy import create
+from jeopardy.models.user import UserOrm
+
+
+async def worker(owner, queue):
+    while True:
+        try:
+            queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return
+        await create.game(
+            owner,
+            name="Benchmark Game",
+            max_teams=3,
+            max_players_per_team=3,
+        )
+
+
+async def main(games, tasks):
+    await Tortoise.init(
+        db_url=getenv("DATABASE_URI"),
+        modules={"models": ["jeopardy.models"]},
+    )
+    try:
+        owner = await UserOrm.create(
+            username="benchmark", is_active=True, auth_provider="none"
+        )
+
+        queue = asyncio.Queue()
+        for i in range(games):
+            queue.put_nowait(i)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(owner, queue) for _ in range(tasks)))
+        elapsed = time.perf_counter() - start
+
+        print(
+            f"{games} games with {tasks} tasks: "
+            f"{games / elapsed:8.1f} games/s"
+        )
+    finally:
+        await Tortoise.close_connections()
+
+
+if __name__ == "__main__":
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    tasks = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    asyncio.run(main(games, tasks))
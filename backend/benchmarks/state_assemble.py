@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""Compare states built per second with and without pydantic validation.
+
+Builds the state of a game with a full 6x5 board and three teams of three
+players in memory, so no database is needed.
+
+Usage:
+    python benchmarks/state_assemble.py [CALLS]
+"""
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+from jeopardy import state
+from jeopardy.models.game import GameStatus
+
+# The reference layout lives with the tests that check state.assemble
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "tests"))
+from legacy_state import board_content  # noqa: E402
+from legacy_state import board_rows  # noqa: E402
+from legacy_state import legacy_full  # noqa: E402
+from legacy_state import legacy_round  # noqa: E402
+
+
+def measure(name, assemble, game, teams, board, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        assemble(game, teams, board)
+    elapsed = time.perf_counter() - start
+    print(
+        f"{name:<8} {calls / elapsed:10.1f} states/s "
+        f"{1000 * elapsed / calls:8.3f} ms/call"
+    )
+
+
+def main(calls):
+    game = SimpleNamespace(
+        code="ABCD",
+        next_message_id=1,
+        next_chooser_id=1,
+        status=GameStatus.STARTED,
+    )
+    teams = [
+        SimpleNamespace(id=i, name=f"Team {i}", players=[
+            SimpleNamespace(id=3 * i + j, username=f"player{3 * i + j}")
+            for j in range(3)
+        ])
+        for i in range(3)
+    ]
+    rows = board_rows()
+
+    measure("before", legacy_full, game, teams, legacy_round(rows), calls)
+    measure("after", state.assemble, game, teams, board_content(rows), calls)
+
+
+if __name__ == "__main__":
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    main(calls)
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Compare queries and latency of building the full state of a game.
+
+Usage:
+    DATABASE_URI=mysql://... python benchmarks/state_full.py GAME_CODE [CALLS]
+"""
+import asyncio
+import sys
+import time
+from os import getenv
+
+from tortoise import Tortoise
+
+from jeopardy import state
+from jeopardy.models.game import GameOrm
+from jeopardy.models.game import RoundClass
+from jeopardy.schema.state import Game
+
+
+async def legacy_full(game: GameOrm) -> Game:
+    """The original implementation of state.full, kept for comparison."""
+    await game.fetch_related("teams__players")
+    await game.fetch_related("next_round__board__categories__tiles__trivia")
+    await game.fetch_related("next_chooser")
+    state = Game.from_orm(game)
+
+    # Set points for tiles in basic rounds
+    if state.round_.class_ != RoundClass.FINAL:
+        if state.round_.class_ == RoundClass.SINGLE:
+            multiplier = 200
+        else:
+            multiplier = 400
+        for category in state.round_.board.categories:
+            for position, tile in enumerate(category.tiles):
+                tile.points = multiplier * (position + 1)
+
+    return state
+
+
+class QueryCounter:
+    """Count the queries sent through a database client."""
+    def __init__(self, db):
+        self.count = 0
+        self._db = db
+        self._execute_query = db.execute_query
+
+    def __enter__(self):
+        async def execute_query(*args, **kwargs):
+            self.count += 1
+            return await self._execute_query(*args, **kwargs)
+        self._db.execute_query = execute_query
+        return self
+
+    def __exit__(self, *exc):
+        self._db.execute_query = self._execute_query
+
+
+async def measure(name, func, game_code, calls):
+    queries = 0
+    elapsed = 0.0
+    for _ in range(calls):
+        game = await GameOrm.get(code=game_code)
+        with QueryCounter(GameOrm._meta.db) as counter:
+            start = time.perf_counter()
+            await func(game)
+            elapsed += time.perf_counter() - start
+        queries += counter.count
+
+    print(
+        f"{name:<8} {queries / calls:6.1f} queries/call "
+        f"{1000 * elapsed / calls:8.2f} ms/call"
+    )
+
+
+async def main(game_code, calls):
+    await Tortoise.init(
+        db_url=getenv("DATABASE_URI"),
+        modules={"models": ["jeopardy.models"]},
+    )
+    try:
+        await measure("before", legacy_full, game_code, calls)
+        await measure("after", state.full, game_code, calls)
+    finally:
+        await Tortoise.close_connections()
+
+
+if __name__ == "__main__":
+    game_code = sys.argv[1]
+    calls = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    asyncio.run(main(game_code, calls))
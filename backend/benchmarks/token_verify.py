@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""Compare tokens verified per second with and without parsed keys.
+
+Uses a freshly generated key pair, so no environment is needed.
+
+Usage:
+    python benchmarks/token_verify.py [TOKENS]
+"""
+import sys
+import time
+
+import jwt
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from jeopardy.keys import KeyManager
+
+
+def key_pair():
+    private_key = rsa.generate_private_key(
+        public_exponent=65537, key_size=2048, backend=default_backend()
+    )
+    private_pem = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.TraditionalOpenSSL,
+        encryption_algorithm=serialization.NoEncryption(),
+    )
+    public_pem = private_key.public_key().public_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo,
+    )
+    return private_pem.decode("utf-8"), public_pem.decode("utf-8")
+
+
+def legacy_decode(token, escaped_public_key):
+    """The verification tokens went through originally, for comparison."""
+    public_key = escaped_public_key.encode("utf-8").decode("unicode_escape")
+    return jwt.decode(token.encode("utf-8"), public_key, algorithms="RS256")
+
+
+def measure(name, decode, token, tokens):
+    start = time.perf_counter()
+    for _ in range(tokens):
+        decode(token)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<8} {tokens / elapsed:10.1f} tokens/s")
+
+
+def main(tokens):
+    private_pem, public_pem = key_pair()
+    escaped_public_key = public_pem.replace("\n", "\\n")
+
+    keys = KeyManager()
+    keys.load(private_pem, public_pem)
+    token = keys.encode({"sub": 1})
+
+    measure(
+        "before", lambda x: legacy_decode(x, escaped_public_key), token, tokens
+    )
+    measure("after", keys.decode, token, tokens)
+
+
+if __name__ == "__main__":
+    tokens = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    main(tokens)
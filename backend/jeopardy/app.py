@@ -7,6 +7,9 @@ from starlette.middleware.sessions import SessionMiddleware
 from tortoise.contrib.fastapi import register_tortoise
 
 from jeopardy.auth import authorize
+from jeopardy.auth import google_discovery
+from jeopardy.keys import keys
+from jeopardy.revocation import revocations
 from jeopardy.middleware import AuthenticationMiddleware
 from jeopardy.routers import auth
 from jeopardy.routers import create
@@ -31,6 +34,35 @@ app.include_router(
 app.include_router(play.router, prefix="/api/v1")
 
 
+@app.on_event("startup")
+async def load_keys():
+    """Parse the token signing keys once rather than on every request."""
+    keys.load_from_env()
+
+
+@app.on_event("startup")
+async def start_revocations():
+    """Keep this worker's list of revoked tokens up to date."""
+    revocations.start()
+
+
+@app.on_event("shutdown")
+async def stop_revocations():
+    revocations.stop()
+
+
+@app.on_event("startup")
+async def load_google_discovery():
+    """Fetch Google's OpenID configuration before anyone needs to log in."""
+    await google_discovery.load()
+    google_discovery.start()
+
+
+@app.on_event("shutdown")
+async def stop_google_discovery():
+    google_discovery.stop()
+
+
 @app.get("/health-check")
 async def health_check():
     """Verify that app is able to respond to incoming requests."""
@@ -1,29 +1,50 @@
+import random
+import time
+import uuid
 from datetime import datetime
 from datetime import timedelta
 from os import getenv
+from typing import Dict
 from typing import Optional
+from typing import Tuple
 
 from authlib.integrations.starlette_client import OAuth
 from fastapi import Depends
-from fastapi import Header
+from fastapi import Request
 from fastapi import Response
 from fastapi.security import SecurityScopes
 import jwt
+from starlette.websockets import WebSocket
+from tortoise.exceptions import IntegrityError
+from tortoise.signals import post_save
+from tortoise.transactions import in_transaction
 
 from jeopardy import exceptions
-from jeopardy.models.user import GoogleUserMetadataOrm
+from jeopardy.cache import TTLCache
+from jeopardy.discovery import DiscoveryCache
+from jeopardy.keys import keys
+from jeopardy.revocation import revocations
+from jeopardy.models.user import AnonymousUserMetadataOrm
+from jeopardy.models.user import AuthProvider
 from jeopardy.models.user import Nobody
 from jeopardy.models.user import UserType
 from jeopardy.models.user import UserOrm
 from jeopardy.schema.user import GoogleUserMetadata
+from jeopardy.schema.user import Principal
 
 
 oauth = OAuth()
+_users = TTLCache(maxsize=1024, ttl=60)
+
+
+GOOGLE_DISCOVERY_URL = (
+    "https://accounts.google.com/.well-known/openid-configuration"
+)
 
 
 oauth.register(
     name="google",
-    server_metadata_url="https://accounts.google.com/.well-known/openid-configuration",
+    server_metadata_url=GOOGLE_DISCOVERY_URL,
     client_id=getenv("GOOGLE_CLIENT_ID"),
     client_secret=getenv("GOOGLE_CLIENT_SECRET"),
     client_kwargs={
@@ -32,13 +53,54 @@ oauth.register(
 )
 
 
+# Saved to disk so restarts, and runs without a network, can skip fetching
+google_discovery = DiscoveryCache(
+    oauth.google,
+    GOOGLE_DISCOVERY_URL,
+    path=getenv("GOOGLE_DISCOVERY_CACHE") or None,
+)
+
+
 async def login_user(response: Response, user: UserOrm) -> None:
     user_token = await token_from_user(user)
     response.set_cookie("user", value=user_token)
 
 
-async def logout_user(response: Response) -> None:
+async def login_guest(response: Response, name: Optional[str] = None) -> None:
+    """Sign in as a new guest without creating anything in the database."""
+    name = name or f"Guest {random.randint(1000, 9999)}"
+    guest_token = await token_from_guest(uuid.uuid4().hex, name)
+    response.set_cookie("user", value=guest_token)
+
+
+async def logout_user(response: Response, token: Optional[str]) -> None:
     response.delete_cookie("user")
+    if token is not None:
+        await revoke_token(token)
+
+
+async def revoke_token(token: str) -> None:
+    """Stop accepting the token, e.g. once the user has logged out."""
+    try:
+        claims = verified_claims(token)
+    except:
+        return
+
+    if "jti" not in claims:
+        return
+
+    # Guests may never have needed a user, and don't need one to log out
+    user_id = claims.get("sub")
+    expire_seconds = claims["exp"] - int(time.time())
+    await revocations.revoke(claims["jti"], user_id, expire_seconds)
+
+
+def verified_claims(token: str) -> Dict:
+    """Verify the JWT and return its claims, unless it has been revoked."""
+    claims = keys.decode(token)
+    if revocations.is_revoked(claims.get("jti")):
+        raise jwt.InvalidTokenError("Token has been revoked")
+    return claims
 
 
 async def token_from_user(user: UserOrm) -> str:
@@ -49,88 +111,248 @@ async def token_from_user(user: UserOrm) -> str:
         "iat": now,
         "exp": now + time_to_expiration,
         "sub": user.id,
+        "jti": uuid.uuid4().hex,
         "roles": ["player"],
         "name": user.username,
+        "scopes": principal_from_user(user).scopes,
     }
 
-    unescaped_private_key = getenv("RSA_PRIVATE_KEY")
-    private_key = unescaped_private_key.encode("utf-8").decode("unicode_escape")
+    return keys.encode(payload)
 
-    token_bytes = jwt.encode(payload, private_key, algorithm="RS256")
-    return token_bytes.decode("utf-8")
 
+async def token_from_guest(guest_id: str, name: str) -> str:
+    """Create a new JWT for a guest, who has no user until they need one."""
+    now = datetime.utcnow()
+    time_to_expiration = timedelta(seconds=3600)
+    payload = {
+        "iat": now,
+        "exp": now + time_to_expiration,
+        "guest": guest_id,
+        "jti": uuid.uuid4().hex,
+        "roles": ["player"],
+        "name": name,
+        "scopes": ["play"],
+    }
 
-async def user_from_token(token: str) -> UserOrm:
-    """Determine the user associated with a JWT."""
-    unescaped_public_key = getenv("RSA_PUBLIC_KEY")
-    public_key = unescaped_public_key.encode("utf-8").decode("unicode_escape")
+    return keys.encode(payload)
 
-    try:
-        token_bytes = token.encode("utf-8")
-        payload = jwt.decode(token_bytes, public_key, algorithms="RS256")
-        user_id = payload["sub"]
+
+async def cached_user(user_id: int) -> Optional[UserOrm]:
+    """Fetch a user, keeping recently used users in memory."""
+    user = _users.get(user_id)
+    if user is None:
         user = await UserOrm.get_or_none(id=user_id)
-    except:
-        user = Nobody
+        if user is not None:
+            _users.set(user_id, user)
+    return user
+
+
+@post_save(UserOrm)
+async def _forget_user(sender, instance, created, using_db, update_fields):
+    """Drop saved users from the cache, e.g. when they're deactivated.
+
+    Bulk updates through a queryset don't send signals, so they have to
+    invalidate the cache themselves.
+    """
+    _users.pop(instance.id)
+
+
+async def guest_user(guest_id: str, name: str) -> UserOrm:
+    """Fetch the user behind a guest token, creating it the first time."""
+    user = await UserOrm.get_or_none(anonymous_metadata__guest_id=guest_id)
+    if user is not None:
+        return user
+
+    try:
+        async with in_transaction():
+            metadata = await AnonymousUserMetadataOrm.create(
+                guest_id=guest_id
+            )
+            user = await UserOrm.create(
+                username=name,
+                auth_provider=AuthProvider.NONE,
+                anonymous_metadata=metadata,
+            )
+    except IntegrityError:
+        # Another connection with the same token created the user first
+        user = await UserOrm.get(anonymous_metadata__guest_id=guest_id)
 
     return user
 
 
+_GOOGLE_METADATA_COLUMNS = (
+    "subject",
+    "email",
+    "given_name",
+    "issuer",
+    "family_name",
+    "name",
+    "locale",
+    "picture",
+)
+
+
+# Setting the id through LAST_INSERT_ID makes MySQL report the id of the
+# existing row when the subject is already known
+_UPSERT_GOOGLE_METADATA = """
+INSERT INTO user_metadata_google
+    (subject, email, given_name, issuer, family_name, name, locale, picture)
+VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+ON DUPLICATE KEY UPDATE
+    id = LAST_INSERT_ID(id),
+    email = VALUES(email),
+    given_name = VALUES(given_name),
+    issuer = VALUES(issuer),
+    family_name = VALUES(family_name),
+    name = VALUES(name),
+    locale = VALUES(locale),
+    picture = VALUES(picture)
+"""
+
+
 async def user_from_google_metadata(
     new_metadata: GoogleUserMetadata
 ) -> UserOrm:
     """Fetch pre-existing user associated with the metadata.
 
-    Create new user if one doesn't already exist.
+    Create new user if one doesn't already exist. Returning users take two
+    statements: one upsert of the metadata and one select of the user.
+
+    Concurrent logins for the same subject serialize on the metadata's unique
+    subject, so the second login only reads the user once the first has
+    committed it.
     """
-    # Update old metadata or create new one
-    old_metadata = await GoogleUserMetadataOrm.get_or_none(
-        subject=new_metadata.subject
-    )
-    if old_metadata is None:
-        metadata = GoogleUserMetadataOrm(**new_metadata.dict())
-    else:
-        metadata = old_metadata
-        metadata.update_from_dict(new_metadata.dict())
-    await metadata.save()
-
-    # Fetch old user or create new one
-    if old_metadata is None:
-        username = metadata.given_name or metadata.email
-        user = await UserOrm.create(
-            username=username,
-            auth_provider="google",
-            google_metadata=metadata,
+    metadata = new_metadata.dict()
+    values = [metadata[x] for x in _GOOGLE_METADATA_COLUMNS]
+
+    async with in_transaction() as connection:
+        metadata_id = await connection.execute_insert(
+            _UPSERT_GOOGLE_METADATA, values
         )
-    else:
-        await metadata.fetch_related("user")
-        user = metadata.user[0]
+        user = await UserOrm.get_or_none(google_metadata_id=metadata_id)
+        if user is None:
+            username = metadata["given_name"] or metadata["email"]
+            user = await UserOrm.create(
+                username=username,
+                auth_provider=AuthProvider.GOOGLE,
+                google_metadata_id=metadata_id,
+            )
 
     return user
 
 
-async def current_user(
-    authorization: Optional[str] = Header(None)
-) -> UserType:
-    """Determine the currently-logged in user from the request header."""
+def trusts_token_claims() -> bool:
+    """Whether to take a valid token's claims as is, without a user lookup."""
+    return getenv("TRUST_TOKEN_CLAIMS", "false").lower() == "true"
+
+
+async def resolve(
+    token: Optional[str]
+) -> Tuple[Principal, Optional[UserType]]:
+    """Verify the JWT once and determine who it was issued to.
+
+    Guests, and users whose token claims are trusted, are taken from the
+    claims alone. Their user is None, left for current_user to load only if
+    it's needed. Otherwise the user is looked up as well.
+    """
     try:
-        user = await user_from_token(authorization)
-        if not user.is_active:
-            user = Nobody
+        claims = verified_claims(token)
     except:
+        return Principal(), Nobody
+
+    if "guest" in claims:
+        principal = Principal(
+            is_active=True,
+            guest_id=claims["guest"],
+            name=claims["name"],
+            scopes=claims["scopes"],
+        )
+        return principal, None
+
+    # Tokens issued before they carried scopes fall back to a user lookup
+    if trusts_token_claims() and "scopes" in claims:
+        principal = Principal(
+            id=claims["sub"],
+            is_active=True,
+            name=claims["name"],
+            scopes=claims["scopes"],
+        )
+        return principal, None
+
+    user = await UserOrm.get_or_none(id=claims["sub"])
+    if user is None or not user.is_active:
+        user = Nobody
+    return principal_from_user(user), user
+
+
+async def user_from_principal(principal: Principal) -> UserType:
+    """Load the user behind a principal, creating a guest's user if needed."""
+    if not principal.is_active:
+        return Nobody
+
+    if principal.guest_id is not None:
+        user = await guest_user(principal.guest_id, principal.name)
+    else:
+        user = await cached_user(principal.id)
+
+    if user is None or not user.is_active:
         user = Nobody
     return user
 
 
-async def authorize(
-    security: SecurityScopes, user: UserType = Depends(current_user)
+def principal_from_user(user: UserType) -> Principal:
+    """Summarize what an authenticated user is allowed to do."""
+    if not user.is_active:
+        return Principal()
+
+    scopes = ["play"]
+    if user.google_metadata_id is not None:
+        scopes.append("create")
+    return Principal(
+        id=user.id, is_active=True, name=user.username, scopes=scopes
+    )
+
+
+def _scope(request: Optional[Request], websocket: Optional[WebSocket]):
+    connection = request if request is not None else websocket
+    return connection.scope
+
+
+async def current_user(
+    request: Request = None, websocket: WebSocket = None
 ) -> UserType:
+    """Determine the currently-logged in user.
+
+    The user is resolved once per request or websocket connection by the
+    AuthenticationMiddleware. For guests, and when token claims are trusted,
+    the middleware only resolves the principal, and the user is loaded here
+    the first time it's needed.
+    """
+    scope = _scope(request, websocket)
+    user = scope.get("user")
+    if user is None:
+        principal = scope.get("principal", Principal())
+        user = scope["user"] = await user_from_principal(principal)
+    return user
+
+
+async def current_principal(
+    request: Request = None, websocket: WebSocket = None
+) -> Principal:
+    """Determine what the currently-logged in user is allowed to do."""
+    return _scope(request, websocket).get("principal", Principal())
+
+
+async def authorize(
+    security: SecurityScopes,
+    principal: Principal = Depends(current_principal),
+) -> Principal:
     """Raise error if user isn't allowed access to the resource."""
-    if not user.is_active:
+    if not principal.is_active:
         raise exceptions.InvalidTokenException(security)
 
-    scopes_for_google_users_only = {"create"}
-    is_google_user = user.google_metadata_id is not None
     for scope in security.scopes:
-        if scope in scopes_for_google_users_only and not is_google_user:
+        if scope not in principal.scopes:
             raise exceptions.InsufficientScopeException(security)
+
+    return principal
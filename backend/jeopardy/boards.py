@@ -0,0 +1,207 @@
+"""Content of the boards of a game's rounds.
+
+Once a game leaves GameStatus.EDITABLE, the categories, tiles and trivia of
+its rounds never change; only reveals, choices and scores do, and those are
+read separately. Each round's board is therefore read in a single query when
+the game starts, or the first time it's needed, and kept in memory from then
+on, shared by every request and viewer of the round.
+
+Boards of games that are still editable are read but not kept.
+
+Each board also indexes its tiles by id, with the category, position and
+points of every tile worked out once, so scoring a response or laying out the
+board is a dictionary lookup. Basic rounds use the standard ladder of 200 or
+400 points a step down a category, unless their board sets its own ladder;
+positions past the end of a custom ladder fall back to the standard one.
+"""
+import json
+from types import MappingProxyType
+from typing import Dict
+from typing import List
+from typing import Mapping
+from typing import NamedTuple
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from jeopardy.cache import LRUCache
+from jeopardy.models.game import GameOrm
+from jeopardy.models.game import GameStatus
+from jeopardy.models.game import RoundClass
+from jeopardy.models.game import RoundOrm
+
+
+class TileContent(NamedTuple):
+    id: int
+    ordinal: int
+    answer: str
+    question: str
+    is_daily_double: bool
+
+
+class CategoryContent(NamedTuple):
+    id: int
+    name: str
+    ordinal: int
+    tiles: Tuple[TileContent, ...]
+
+
+class TilePlace(NamedTuple):
+    tile: TileContent
+    class_: RoundClass
+    category_id: int
+    # Position of the tile within its category, starting from the top
+    position: int
+    # Null in the final round, where teams play for what they wager
+    points: Optional[int]
+
+
+class RoundContent(NamedTuple):
+    id: int
+    class_: RoundClass
+    # Null when the round doesn't have a board yet
+    num_categories: Optional[int]
+    categories: Tuple[CategoryContent, ...]
+    places: Mapping[int, TilePlace]
+
+    @property
+    def num_tiles(self) -> int:
+        return len(self.places)
+
+    def place(self, tile_id: int) -> Optional[TilePlace]:
+        return self.places.get(tile_id)
+
+    def tile(self, tile_id: int) -> Optional[TileContent]:
+        place = self.places.get(tile_id)
+        return None if place is None else place.tile
+
+    def position(self, tile_id: int) -> Optional[int]:
+        """Find the position of the tile within its category."""
+        place = self.places.get(tile_id)
+        return None if place is None else place.position
+
+
+STANDARD_POINTS = {
+    RoundClass.SINGLE: 200,
+    RoundClass.DOUBLE: 400,
+}
+
+
+def tile_points(
+    class_: RoundClass,
+    position: int,
+    point_ladder: Optional[Sequence[int]] = None,
+) -> Optional[int]:
+    """Work out the points of a tile from its position in its category."""
+    if class_ == RoundClass.FINAL:
+        return None
+    if point_ladder is not None and position < len(point_ladder):
+        return point_ladder[position]
+    return STANDARD_POINTS[class_] * (position + 1)
+
+
+_rounds = LRUCache(maxsize=512)
+
+
+async def load(round_id: int) -> Optional[RoundContent]:
+    """Fetch the content of the round's board."""
+    content = _rounds.get(round_id)
+    if content is None:
+        content, status = await _read(round_id)
+        if content is not None and status != GameStatus.EDITABLE:
+            _rounds.set(round_id, content)
+    return content
+
+
+async def build(game: GameOrm) -> None:
+    """Read and keep the boards of all of the game's rounds."""
+    rows = await RoundOrm.filter(game_id=game.id).values("id")
+    for row in rows:
+        content, _ = await _read(row["id"])
+        if content is not None:
+            _rounds.set(row["id"], content)
+
+
+async def _read(
+    round_id: int
+) -> Tuple[Optional[RoundContent], Optional[GameStatus]]:
+    """Helper for load. Read the round's whole board in a single query."""
+    rows = (
+        await RoundOrm
+        .filter(id=round_id)
+        .values(
+            "class_",
+            status="game__status",
+            num_categories="board__num_categories",
+            point_ladder="board__point_ladder",
+            category_id="board__categories__id",
+            category_name="board__categories__name",
+            category_ordinal="board__categories__ordinal",
+            tile_id="board__categories__tiles__id",
+            tile_ordinal="board__categories__tiles__ordinal",
+            is_daily_double="board__categories__tiles__is_daily_double",
+            answer="board__categories__tiles__trivia__answer",
+            question="board__categories__tiles__trivia__question",
+        )
+    )
+    return _content(round_id, rows)
+
+
+def _content(
+    round_id: int, rows: List[Dict]
+) -> Tuple[Optional[RoundContent], Optional[GameStatus]]:
+    """Helper for _read. Lay out the board from its rows, in any order."""
+    if len(rows) == 0:
+        return None, None
+
+    grouped: Dict[int, Tuple[Dict, List[TileContent]]] = {}
+    for row in rows:
+        if row["category_id"] is None:
+            continue
+        _, tiles = grouped.setdefault(row["category_id"], (row, []))
+        if row["tile_id"] is not None:
+            tiles.append(TileContent(
+                id=row["tile_id"],
+                ordinal=row["tile_ordinal"],
+                answer=row["answer"],
+                question=row["question"],
+                is_daily_double=bool(row["is_daily_double"]),
+            ))
+
+    class_ = RoundClass(rows[0]["class_"])
+    point_ladder = rows[0]["point_ladder"]
+    if point_ladder is not None:
+        point_ladder = json.loads(point_ladder)
+
+    categories = tuple(sorted(
+        (
+            CategoryContent(
+                id=row["category_id"],
+                name=row["category_name"],
+                ordinal=row["category_ordinal"],
+                tiles=tuple(sorted(tiles, key=lambda x: x.ordinal)),
+            )
+            for row, tiles in grouped.values()
+        ),
+        key=lambda x: x.ordinal,
+    ))
+    places = {
+        tile.id: TilePlace(
+            tile=tile,
+            class_=class_,
+            category_id=category.id,
+            position=position,
+            points=tile_points(class_, position, point_ladder),
+        )
+        for category in categories
+        for position, tile in enumerate(category.tiles)
+    }
+
+    content = RoundContent(
+        id=round_id,
+        class_=class_,
+        num_categories=rows[0]["num_categories"],
+        categories=categories,
+        places=MappingProxyType(places),
+    )
+    return content, GameStatus(rows[0]["status"])
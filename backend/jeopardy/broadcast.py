@@ -0,0 +1,176 @@
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Dict
+from typing import Mapping
+from typing import Optional
+from typing import Tuple
+
+from starlette.websockets import WebSocket
+
+from jeopardy import delta
+from jeopardy import frames
+from jeopardy.cache import LRUCache
+from jeopardy.frames import View
+from jeopardy.schema.state import Audience
+
+
+class Hub:
+    """Fan out game state changes to every websocket connected to a game.
+
+    Each change is rendered and encoded once per audience and the same message
+    is sent to all of the game's subscribers in that audience, rather than
+    each connection rebuilding, redacting or encoding the state for itself.
+
+    Subscribers get a full snapshot when they connect. After that, each change
+    is sent as a patch from the previous message id to the new one. A patch is
+    only sent when the hub saw the immediately preceding state; otherwise a
+    snapshot is sent in its place.
+
+    Clients without a websocket can instead wait for the game's next message.
+    Waiters on a game share one future that is resolved when the game
+    publishes, so any number of them costs nothing until then. Only changes
+    published by this process wake waiters; those made in another worker are
+    picked up when the wait times out.
+
+    Games are kept apart by id rather than code, since a finished game's code
+    is handed out again to a new game.
+    """
+    def __init__(self):
+        self._subscribers: Dict[int, Dict[WebSocket, Audience]] = (
+            defaultdict(dict)
+        )
+        self._views: Dict[Tuple[int, Audience], View] = {}
+        # Views of the latest message of each game, by game id
+        self._latest = LRUCache(maxsize=1024)
+        self._waiters: Dict[int, asyncio.Future] = {}
+        self._num_waiting: Dict[int, int] = defaultdict(int)
+
+    def subscribe(
+        self,
+        game_id: int,
+        websocket: WebSocket,
+        audience: Audience = Audience.PLAYER,
+    ) -> None:
+        self._subscribers[game_id][websocket] = audience
+
+    def unsubscribe(self, game_id: int, websocket: WebSocket) -> None:
+        subscribers = self._subscribers.get(game_id, {})
+        subscribers.pop(websocket, None)
+        if len(subscribers) == 0:
+            self._subscribers.pop(game_id, None)
+            for audience in Audience:
+                self._views.pop((game_id, audience), None)
+
+    async def publish(
+        self, game_id: int, views: Mapping[Audience, View]
+    ) -> None:
+        """Send the new state of the game to all of its subscribers.
+
+        Changes are published by independent requests, which can finish out
+        of order. Views that aren't past the latest published message would
+        take everyone back to an older state, so they're dropped.
+        """
+        latest = self._latest.get(game_id)
+        if latest is not None and _message_id(views) <= _message_id(latest):
+            return
+
+        self._latest.set(game_id, views)
+        waiter = self._waiters.pop(game_id, None)
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+        subscribers = list(self._subscribers.get(game_id, {}).items())
+        if len(subscribers) == 0:
+            return
+
+        messages = {
+            audience: self._message(game_id, audience, views[audience])
+            for audience in {audience for _, audience in subscribers}
+        }
+        await asyncio.gather(*(
+            self._send(game_id, websocket, messages[audience])
+            for websocket, audience in subscribers
+        ))
+
+    async def wait(
+        self, game_id: int, after: int, timeout: float
+    ) -> Optional[Mapping[Audience, View]]:
+        """Wait for the game to publish a message past the id.
+
+        Returns the views of that message, or None if none was published
+        before the timeout.
+        """
+        loop = asyncio.get_event_loop()
+        deadline = loop.time() + timeout
+        while True:
+            # A message published before waiting started still counts
+            views = self._latest.get(game_id)
+            if views is not None and _message_id(views) > after:
+                return views
+
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return None
+
+            waiter = self._waiters.get(game_id)
+            if waiter is None or waiter.done():
+                waiter = loop.create_future()
+                self._waiters[game_id] = waiter
+
+            self._num_waiting[game_id] += 1
+            try:
+                # Shielded so that one waiter timing out leaves the rest
+                await asyncio.wait_for(asyncio.shield(waiter), remaining)
+            except asyncio.TimeoutError:
+                return None
+            finally:
+                self._num_waiting[game_id] -= 1
+                if self._num_waiting[game_id] == 0:
+                    self._num_waiting.pop(game_id)
+                    if self._waiters.get(game_id) is waiter:
+                        self._waiters.pop(game_id)
+                        waiter.cancel()
+
+    def _message(
+        self, game_id: int, audience: Audience, view: View
+    ) -> str:
+        """Encode the message that moves the audience on to the view."""
+        previous_view = self._views.get((game_id, audience))
+        self._views[(game_id, audience)] = view
+
+        if _is_previous(previous_view, view):
+            frame = frames.encode({
+                "type": "patch",
+                "from": previous_view.message_id,
+                "message_id": view.message_id,
+                "operations": delta.diff(previous_view.state, view.state),
+            })
+        else:
+            frame = frames.snapshot(view)
+
+        # Websocket clients read text frames, so decode once for all of them
+        return frame.decode("utf-8")
+
+    async def _send(
+        self, game_id: int, websocket: WebSocket, message: str
+    ) -> None:
+        try:
+            await websocket.send_text(message)
+        except Exception:
+            logging.info(f"Dropping closed connection to game: {game_id}")
+            self.unsubscribe(game_id, websocket)
+
+
+def _message_id(views: Mapping[Audience, View]) -> int:
+    """Every audience's view is of the same message."""
+    return next(iter(views.values())).message_id or 0
+
+
+def _is_previous(previous_view: View, view: View) -> bool:
+    if previous_view is None or previous_view.message_id is None:
+        return False
+    return previous_view.message_id + 1 == view.message_id
+
+
+hub = Hub()
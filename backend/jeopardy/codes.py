@@ -0,0 +1,231 @@
+"""Allocation of the four letter codes that players use to join games.
+
+Codes are handed out from an in-memory pool, so creating a game doesn't probe
+the database for a free code. The pool is refilled a batch at a time, first
+with codes recycled from finished or abandoned games and then with codes drawn
+in a random order that visits every code once before repeating. Drawn codes
+are checked against the games table a stretch of the order at a time, so
+refills find the free codes in a few queries however many are taken.
+
+Another process may hand out the same code from its own pool. The unique key
+on the games table catches that, and the creator retries with the next code.
+
+Resolving a code to its game goes through a cache of game ids, statuses and
+owners, which also remembers codes that no game is using for a few seconds, so
+that polling a game or guessing codes doesn't query the database every time.
+Changes made in this process update the cache directly; changes made by
+other processes show up once the entries expire.
+"""
+import asyncio
+import math
+import random
+import string
+from datetime import datetime
+from datetime import timedelta
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+
+from tortoise.query_utils import Q
+
+from jeopardy import exceptions
+from jeopardy.cache import TTLCache
+from jeopardy.models.game import GameOrm
+from jeopardy.models.game import GameStatus
+
+
+CODE_LENGTH = 4
+ALPHABET = string.ascii_uppercase
+NUM_CODES = len(ALPHABET) ** CODE_LENGTH
+
+# Most codes checked against the games table in one query
+MAX_DRAW_SPAN = 16 * 1024
+
+
+class CodePool:
+    def __init__(
+        self,
+        batch_size: int = 256,
+        finished_seconds: float = 60 * 60,
+        idle_seconds: float = 7 * 24 * 60 * 60,
+    ):
+        self.batch_size = batch_size
+        self.finished_seconds = finished_seconds
+        self.idle_seconds = idle_seconds
+        self._codes: List[str] = []
+        self._lock = asyncio.Lock()
+
+        # Codes are drawn in the order start, start + stride, ... wrapping
+        # around the code space. A stride coprime with its size visits every
+        # code once before repeating.
+        self._start = random.randrange(NUM_CODES)
+        self._stride = _coprime_stride(NUM_CODES)
+        self._position = 0
+
+    async def allocate(self) -> str:
+        """Take an unused code out of the pool."""
+        while len(self._codes) == 0:
+            async with self._lock:
+                if len(self._codes) == 0:
+                    await self.refill()
+        return self._codes.pop()
+
+    async def refill(self) -> None:
+        """Add a batch of unused codes to the pool."""
+        codes = await self._recycle()
+        if len(codes) < self.batch_size:
+            count = self.batch_size - len(codes)
+            codes.extend(await self._draw(count, skip=set(codes)))
+        if len(codes) == 0:
+            raise exceptions.GameCodesExhaustedException
+
+        random.shuffle(codes)
+        self._codes.extend(codes)
+
+    async def _recycle(self) -> List[str]:
+        """Release the codes of games that have finished or been abandoned.
+
+        Finished games keep their code for a while so that players can still
+        look at the final scores. Of the games that are still going, only
+        those left waiting for players give up their code once idle; hosts
+        can come back to a board they're editing or a game they've started.
+        """
+        now = datetime.utcnow()
+        finished_before = now - timedelta(seconds=self.finished_seconds)
+        idle_before = now - timedelta(seconds=self.idle_seconds)
+
+        recyclable = Q(
+            Q(status=GameStatus.FINISHED, updated_ts__lt=finished_before)
+            | Q(status=GameStatus.JOINABLE, updated_ts__lt=idle_before),
+            code__isnull=False,
+        )
+        games = (
+            await GameOrm
+            .filter(recyclable)
+            .limit(self.batch_size)
+            .values("id", "code")
+        )
+        if len(games) == 0:
+            return []
+
+        # Release by row, so that a code another worker recycled and handed
+        # to a new game in the meantime stays with that game
+        ids = [x["id"] for x in games]
+        num_released = (
+            await GameOrm.filter(recyclable, id__in=ids).update(code=None)
+        )
+        codes = [x["code"] for x in games]
+        if num_released < len(games):
+            released = set(
+                await GameOrm
+                .filter(id__in=ids, code__isnull=True)
+                .values_list("id", flat=True)
+            )
+            codes = [x["code"] for x in games if x["id"] in released]
+            codes = list(set(codes) - await self._in_use(codes))
+
+        for code in codes:
+            forget(code)
+        return codes
+
+    async def _draw(
+        self, count: int, skip: Set[str] = frozenset()
+    ) -> List[str]:
+        """Draw codes that no game is using, following the pool's order.
+
+        Each query checks the next stretch of the order, twice as long as the
+        last whenever it came up short, until enough codes are found or the
+        whole code space has been checked. Codes to skip, like those already
+        in the pool, are free but mustn't be handed out twice.
+        """
+        skip = skip | set(self._codes)
+        codes: List[str] = []
+        span = count
+        remaining = NUM_CODES
+        while len(codes) < count and remaining > 0:
+            span = min(span, remaining, MAX_DRAW_SPAN)
+            candidates = [self._next_code() for _ in range(span)]
+            remaining -= span
+
+            in_use = await self._in_use(candidates)
+            codes.extend(
+                x for x in candidates if x not in in_use and x not in skip
+            )
+            span *= 2
+        return codes
+
+    def _next_code(self) -> str:
+        """Helper for _draw."""
+        index = (self._start + self._position * self._stride) % NUM_CODES
+        self._position = (self._position + 1) % NUM_CODES
+        return code_at(index)
+
+    async def _in_use(self, candidates: List[str]) -> Set[str]:
+        """Helper for _draw. Find which of the codes games are using."""
+        in_use = (
+            await GameOrm
+            .filter(code__in=candidates)
+            .values_list("code", flat=True)
+        )
+        return set(in_use)
+
+
+def code_at(index: int) -> str:
+    """Spell out the code at the index of the code space, e.g. 0 is AAAA."""
+    letters = []
+    for _ in range(CODE_LENGTH):
+        index, digit = divmod(index, len(ALPHABET))
+        letters.append(ALPHABET[digit])
+    return "".join(reversed(letters))
+
+
+def _coprime_stride(size: int) -> int:
+    """Helper for CodePool. Pick a random stride that shares no factor."""
+    while True:
+        stride = random.randrange(1, size)
+        if math.gcd(stride, size) == 1:
+            return stride
+
+
+pool = CodePool()
+
+
+# Id, status and owner id of a game
+GameRef = Tuple[int, GameStatus, int]
+
+_games = TTLCache(maxsize=4096, ttl=30)
+_unknown_codes = TTLCache(maxsize=4096, ttl=5)
+
+
+async def resolve(code: str) -> Optional[GameRef]:
+    """Find the id, status and owner of the game using the code, if any."""
+    game_ref = _games.get(code)
+    if game_ref is not None:
+        return game_ref
+    if code in _unknown_codes:
+        return None
+
+    games = await GameOrm.filter(code=code).values("id", "status", "owner_id")
+    if len(games) == 0:
+        _unknown_codes.set(code, True)
+        return None
+
+    game = games[0]
+    game_ref = (game["id"], game["status"], game["owner_id"])
+    _games.set(code, game_ref)
+    return game_ref
+
+
+def remember(game: GameOrm) -> None:
+    """Update the cache with the game, e.g. once its status has changed."""
+    if game.code is None:
+        return
+    _unknown_codes.pop(game.code)
+    _games.set(game.code, (game.id, game.status, game.owner_id))
+
+
+def forget(code: str) -> None:
+    """Drop what the cache knows about the code."""
+    _games.pop(code)
+    _unknown_codes.pop(code)
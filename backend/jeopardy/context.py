@@ -0,0 +1,67 @@
+from typing import Optional
+
+from jeopardy import boards
+from jeopardy.models.game import GameOrm
+from jeopardy.models.game import RoundOrm
+from jeopardy.models.game import TileOrm
+from jeopardy.models.team import TeamOrm
+from jeopardy.models.user import UserOrm
+
+
+class ActionContext:
+    """Rows needed to validate and perform a single action on a tile.
+
+    The context is loaded once per request and then passed through validation
+    and perform, so that each step doesn't query for the same team, tile and
+    round again.
+    """
+    def __init__(
+        self,
+        game: GameOrm,
+        player: UserOrm,
+        team: Optional[TeamOrm],
+        tile: Optional[TileOrm],
+        round_: Optional[RoundOrm],
+    ):
+        self.game = game
+        self.player = player
+        self.team = team
+        self.tile = tile
+        self.round_ = round_
+
+    @classmethod
+    async def load(
+        cls, game: GameOrm, player: UserOrm, tile_id: int
+    ) -> "ActionContext":
+        team = await player.team(game)
+        tile = await TileOrm.get_or_none(id=tile_id)
+
+        # Tiles are nearly always in the game's current round, whose cached
+        # board can place the tile without joining across the board tables
+        board = None
+        if game.next_round_id is not None:
+            board = await boards.load(game.next_round_id)
+
+        if board is not None and board.tile(tile_id) is not None:
+            round_ = await RoundOrm.get(id=game.next_round_id)
+        else:
+            round_ = (
+                await RoundOrm
+                .filter(board__categories__tiles__id=tile_id)
+                .first()
+            )
+        return cls(game, player, team, tile, round_)
+
+    @property
+    def is_next_round(self) -> bool:
+        """Whether the tile belongs to the round the game is currently in."""
+        if self.round_ is None:
+            return False
+        return self.round_.id == self.game.next_round_id
+
+    @property
+    def is_next_chooser(self) -> bool:
+        """Whether the player's team is the one that chooses the next tile."""
+        if self.team is None:
+            return False
+        return self.team.id == self.game.next_chooser_id
@@ -1,6 +1,10 @@
-import random
-import string
+from typing import List
 
+from tortoise.backends.base.client import BaseDBAsyncClient
+from tortoise.exceptions import IntegrityError
+from tortoise.transactions import in_transaction
+
+from jeopardy import codes
 from jeopardy import state
 from jeopardy.models.game import BoardOrm
 from jeopardy.models.game import CategoryOrm
@@ -8,52 +12,114 @@ from jeopardy.models.game import GameOrm
 from jeopardy.models.game import RoundClass
 from jeopardy.models.game import RoundOrm
 from jeopardy.models.game import TileOrm
-from jeopardy.models.game import TriviaOrm
 from jeopardy.models.user import UserOrm
 from jeopardy.schema.state import Game
 
 
+CODE_ATTEMPTS = 3
+
+
 async def new_game_code() -> str:
-    """Generate a game code that hasn't been used before."""
-    code = "".join(random.choice(string.ascii_uppercase) for _ in range(4))
-    is_in_use = await GameOrm.get_or_none(code=code) is not None
-    while is_in_use:
-        code = "".join(random.choice(string.ascii_uppercase) for _ in range(4))
-        is_in_use = await GameOrm.get_or_none(code=code) is not None
-    return code
+    """Allocate a game code that no other game is using."""
+    return await codes.pool.allocate()
 
 
 async def game(
     owner: UserOrm, *, name: str, max_teams: int, max_players_per_team: int,
 ) -> Game:
     """Create a new game."""
-    game_orm = await GameOrm.create(
-        name=name,
-        code=await new_game_code(),
-        owner=owner,
-        max_teams=max_teams,
-        max_players_per_team=max_players_per_team,
-        next_message_id=0,
-        is_started=False,
-        is_finished=False,
-    )
+    # Another process may have handed out the same code, so retry with a new
+    # one if the code turns out to be taken
+    for attempt in range(CODE_ATTEMPTS):
+        try:
+            game_orm = await _game(
+                owner,
+                code=await new_game_code(),
+                name=name,
+                max_teams=max_teams,
+                max_players_per_team=max_players_per_team,
+            )
+        except IntegrityError:
+            if attempt + 1 == CODE_ATTEMPTS:
+                raise
+        else:
+            break
 
-    # Pre-create a board for the time being. To be removed later.
-    round_ = await RoundOrm.create(
-        game=game_orm, class_=RoundClass.SINGLE, ordinal=0
-    )
-    game_orm.next_round = round_
-    await game_orm.save()
+    codes.remember(game_orm)
+    return await state.full(game_orm)
 
-    board = await BoardOrm.create(round_=round_)
-    for i in range(board.num_categories):
-        category = await CategoryOrm.create(
-            board=board, name=f"Category {i}", ordinal=i
+
+async def _game(
+    owner: UserOrm,
+    *,
+    code: str,
+    name: str,
+    max_teams: int,
+    max_players_per_team: int,
+) -> GameOrm:
+    """Helper for game."""
+    async with in_transaction() as connection:
+        game_orm = await GameOrm.create(
+            name=name,
+            code=code,
+            owner=owner,
+            max_teams=max_teams,
+            max_players_per_team=max_players_per_team,
+            next_message_id=0,
+            is_started=False,
+            is_finished=False,
         )
-        for j in range(board.num_tiles_per_category):
-            trivia = await TriviaOrm.create(
-                answer="Answer", question="Question?"
-            )
-            await TileOrm.create(category=category, trivia=trivia, ordinal=j)
 
-    return await state.full(game_orm.code)
+        # Pre-create a board for the time being. To be removed later.
+        round_ = await RoundOrm.create(
+            game=game_orm, class_=RoundClass.SINGLE, ordinal=0
+        )
+        game_orm.next_round = round_
+        await game_orm.save()
+        await _board(connection, round_)
+
+    return game_orm
+
+
+async def _board(
+    connection: BaseDBAsyncClient, round_: RoundOrm
+) -> BoardOrm:
+    """Create a placeholder board with a handful of bulk inserts."""
+    board = await BoardOrm.create(round_=round_)
+    await CategoryOrm.bulk_create([
+        CategoryOrm(board=board, name=f"Category {i}", ordinal=i)
+        for i in range(board.num_categories)
+    ])
+    category_ids = (
+        await CategoryOrm
+        .filter(board=board)
+        .order_by("ordinal")
+        .values_list("id", flat=True)
+    )
+
+    num_tiles = board.num_categories * board.num_tiles_per_category
+    trivia_ids = iter(await _placeholder_trivia(connection, num_tiles))
+    await TileOrm.bulk_create([
+        TileOrm(category_id=category_id, trivia_id=next(trivia_ids), ordinal=j)
+        for category_id in category_ids
+        for j in range(board.num_tiles_per_category)
+    ])
+    return board
+
+
+async def _placeholder_trivia(
+    connection: BaseDBAsyncClient, count: int
+) -> List[int]:
+    """Insert placeholder trivia in one statement and return their ids.
+
+    Bulk inserts don't report the ids they generate, so the rows are
+    inserted with a single multi-row INSERT instead. MySQL reports the id of
+    its first row, and gives the rows of one such insert consecutive ids with
+    the default auto-increment lock mode.
+    """
+    rows = ", ".join(["(%s, %s)"] * count)
+    values = ["Answer", "Question?"] * count
+    first_id = await connection.execute_insert(
+        f"INSERT INTO trivia (answer, question) VALUES {rows}", values
+    )
+    return list(range(first_id, first_id + count))
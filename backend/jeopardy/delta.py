@@ -0,0 +1,89 @@
+"""JSON patch style differences between consecutive game states.
+
+Operations follow the layout of RFC 6902, restricted to the "add", "remove"
+and "replace" operations:
+    https://tools.ietf.org/html/rfc6902
+"""
+import copy
+from typing import Any
+from typing import Dict
+from typing import List
+
+
+Operation = Dict[str, Any]
+
+
+def diff(old: Any, new: Any, path: str = "") -> List[Operation]:
+    """Determine the operations that transform the old value into the new."""
+    if old == new:
+        operations = []
+
+    elif isinstance(old, dict) and isinstance(new, dict):
+        operations = []
+        for key in old:
+            if key not in new:
+                operations.append({"op": "remove", "path": _path(path, key)})
+        for key, value in new.items():
+            if key in old:
+                operations.extend(diff(old[key], value, _path(path, key)))
+            else:
+                operations.append(
+                    {"op": "add", "path": _path(path, key), "value": value}
+                )
+
+    elif isinstance(old, list) and isinstance(new, list):
+        operations = []
+        for i, (old_item, new_item) in enumerate(zip(old, new)):
+            operations.extend(diff(old_item, new_item, _path(path, i)))
+        for i in range(len(old), len(new)):
+            operations.append(
+                {"op": "add", "path": _path(path, i), "value": new[i]}
+            )
+        # Remove from the end so earlier indices stay valid
+        for i in reversed(range(len(new), len(old))):
+            operations.append({"op": "remove", "path": _path(path, i)})
+
+    else:
+        operations = [{"op": "replace", "path": path, "value": new}]
+
+    return operations
+
+
+def apply(document: Any, operations: List[Operation]) -> Any:
+    """Apply operations produced by diff to a copy of the document."""
+    document = copy.deepcopy(document)
+    for operation in operations:
+        keys = _keys(operation["path"])
+        if len(keys) == 0:
+            document = copy.deepcopy(operation["value"])
+            continue
+
+        parent = document
+        for key in keys[:-1]:
+            parent = parent[int(key) if isinstance(parent, list) else key]
+
+        key = keys[-1]
+        if isinstance(parent, list):
+            key = int(key)
+            if operation["op"] == "add":
+                parent.insert(key, copy.deepcopy(operation["value"]))
+                continue
+        if operation["op"] == "remove":
+            del parent[key]
+        else:
+            parent[key] = copy.deepcopy(operation["value"])
+
+    return document
+
+
+def _path(parent: str, key: Any) -> str:
+    escaped = str(key).replace("~", "~0").replace("/", "~1")
+    return f"{parent}/{escaped}"
+
+
+def _keys(path: str) -> List[str]:
+    if path == "":
+        return []
+    return [
+        x.replace("~1", "/").replace("~0", "~") for x in path.split("/")[1:]
+    ]
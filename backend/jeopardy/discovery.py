@@ -0,0 +1,124 @@
+"""OpenID discovery document and signing keys of an OAuth provider.
+
+Authlib fetches the provider's discovery document and JWKS over the network
+on the first login and keeps them for the life of the process. Instead, they
+are loaded when the app starts, from a copy on disk when it is fresh enough,
+and refreshed in the background, so logins never wait on those fetches.
+
+When the provider can't be reached, a stale copy on disk is used as is. This
+lets tests and local runs work offline from a saved copy.
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Dict
+from typing import Optional
+
+import httpx
+
+
+class DiscoveryCache:
+    def __init__(
+        self,
+        client,
+        url: str,
+        path: Optional[str] = None,
+        ttl: float = 24 * 60 * 60,
+        refresh_seconds: float = 60 * 60,
+    ):
+        self.client = client
+        self.url = url
+        self.path = path
+        self.ttl = ttl
+        self.refresh_seconds = refresh_seconds
+        self.document: Optional[Dict] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def is_fresh(self) -> bool:
+        if self.document is None:
+            return False
+        return time.time() - self.document["loaded_at"] < self.ttl
+
+    async def load(self) -> None:
+        """Load the cached copy, fetching a new one if it's missing or old."""
+        if self.document is None:
+            self.document = self._read()
+        if not self.is_fresh:
+            try:
+                await self.refresh()
+            except Exception:
+                logging.exception(f"Failed to fetch discovery: {self.url}")
+
+        # Without any copy, the client falls back to fetching on first login
+        if self.document is not None:
+            self._install()
+
+    async def refresh(self) -> None:
+        """Fetch the discovery document and JWKS from the provider."""
+        async with httpx.AsyncClient() as http:
+            response = await http.get(self.url)
+            response.raise_for_status()
+            metadata = response.json()
+
+            response = await http.get(metadata["jwks_uri"])
+            response.raise_for_status()
+            jwks = response.json()
+
+        self.document = {
+            "loaded_at": time.time(),
+            "metadata": metadata,
+            "jwks": jwks,
+        }
+        self._install()
+        self._write()
+
+    def start(self) -> None:
+        """Keep refreshing the document in the background."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_seconds)
+            try:
+                await self.refresh()
+            except Exception:
+                logging.exception(f"Failed to refresh discovery: {self.url}")
+
+    def _install(self) -> None:
+        """Hand the document to the OAuth client so it won't fetch its own."""
+        self.client.server_metadata.update({
+            **self.document["metadata"],
+            "jwks": self.document["jwks"],
+            "_loaded_at": self.document["loaded_at"],
+        })
+
+    def _read(self) -> Optional[Dict]:
+        if self.path is None:
+            return None
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write(self) -> None:
+        if self.path is None:
+            return
+        # Write a new file and swap it in, so other workers never read a
+        # partly written copy
+        partial_path = f"{self.path}.{os.getpid()}"
+        try:
+            with open(partial_path, "w") as f:
+                json.dump(self.document, f)
+            os.replace(partial_path, self.path)
+        except OSError:
+            logging.exception(f"Failed to save discovery: {self.path}")
@@ -98,3 +98,8 @@ class TileAlreadyChosenException(InvalidRequestException):
 class TileNotFoundException(InvalidRequestException):
     """Exception when player chooses a tile that isn't part of the game."""
     pass
+
+
+class GameCodesExhaustedException(Exception):
+    """Exception when every game code is in use and none can be recycled."""
+    pass
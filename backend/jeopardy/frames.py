@@ -0,0 +1,90 @@
+"""Game states and messages encoded to JSON once and sent as is.
+
+A view of a game's state is sent to every websocket and HTTP client of its
+audience. Each view is encoded once, the first time it's sent, and the same
+UTF-8 bytes go to every client, so encoding doesn't grow with the number of
+viewers. Snapshot messages are put together around the view's bytes rather
+than encoding the view again.
+
+orjson is used when it's installed, since it encodes several times faster
+than the standard library. Either way the output is compact UTF-8 JSON.
+
+Over HTTP, each view is tagged with an ETag made of its game, message id and
+audience. The message id only ever grows, so a client whose copy carries the
+current tag already has the current view.
+"""
+import json
+from typing import Any
+from typing import Dict
+from typing import Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from jeopardy.schema.state import Audience
+
+
+def encode(value: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(
+        value, separators=(",", ":"), ensure_ascii=False
+    ).encode("utf-8")
+
+
+class View:
+    """One audience's view of the state of a game at one message.
+
+    Views are shared by every request and connection, so neither the state
+    nor its encoding may be changed.
+    """
+    __slots__ = ("state", "_body")
+
+    def __init__(self, state: Dict):
+        self.state = state
+        self._body: Optional[bytes] = None
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, View) and self.state == other.state
+
+    @property
+    def message_id(self) -> Optional[int]:
+        return self.state["message_id"]
+
+    @property
+    def body(self) -> bytes:
+        """The state encoded as JSON."""
+        if self._body is None:
+            self._body = encode(self.state)
+        return self._body
+
+
+def snapshot(view: View) -> bytes:
+    """Wrap the view in a snapshot message for a subscriber."""
+    return b"".join((
+        b'{"type":"snapshot","message_id":',
+        encode(view.message_id),
+        b',"state":',
+        view.body,
+        b"}",
+    ))
+
+
+def etag(game_id: int, message_id: Optional[int], audience: Audience) -> str:
+    """Tag the audience's view of the game at the message for HTTP caching."""
+    return f'"{game_id}-{message_id or 0}-{audience.value}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against the ETag of the current view."""
+    if if_none_match is None:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate in ("*", etag):
+            return True
+    return False
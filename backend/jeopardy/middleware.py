@@ -1,25 +1,30 @@
-from starlette.datastructures import MutableHeaders
 from starlette.requests import HTTPConnection
 from starlette.types import ASGIApp
 from starlette.types import Receive
 from starlette.types import Scope
 from starlette.types import Send
 
+from jeopardy.auth import resolve
+
 
 class AuthenticationMiddleware:
-    """Simplify browser API calls by moving the user cookie to a header.
+    """Resolve the user behind a request once and keep them in the scope.
 
-    Using the cookie in the browser is convenient because it enables easy login
-    and logout across all tabs in a browser as well as simplifies automatic
-    logout when the browser is closed.
+    The token is read from the Authorization header, or else from the user
+    cookie. Using the cookie in the browser is convenient because it enables
+    easy login and logout across all tabs in a browser as well as simplifies
+    automatic logout when the browser is closed. Using the Authorization
+    header is convenient for non-browser API calls (e.g. testing).
 
-    Using the Authorization header for API calls to the backend is convenient
-    because it enables cleaner generated docs and simplifies non-browser API
-    calls (e.g. testing). It's also considered a best practice generally.
+    The token is verified here, once per request or websocket connection, and
+    the user and their principal are stored in the scope as "user" and
+    "principal". Dependencies such as current_user and authorize read them
+    from there rather than verifying the token again, and a websocket keeps
+    the same user for as long as it stays connected.
 
-    Thus, this is the interface that allows the browser to continue using
-    cookies while the backend only accepts API calls with auth information in
-    the header.
+    Guest tokens, and all tokens when TRUST_TOKEN_CLAIMS=true, are resolved
+    from their claims alone, so authentication doesn't touch the database.
+    The user is then only loaded by endpoints that need it.
     """
     def __init__(self, app: ASGIApp):
         self.app = app
@@ -27,8 +32,12 @@ class AuthenticationMiddleware:
     async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         if scope["type"] in ("http", "websocket"):
             connection = HTTPConnection(scope)
-            if "user" in connection.cookies:
-                user_auth = connection.cookies["user"]
-                headers = MutableHeaders(scope=scope)
-                headers.setdefault("Authorization", user_auth)
+            token = connection.headers.get("Authorization")
+            if token is None:
+                token = connection.cookies.get("user")
+
+            principal, user = await resolve(token)
+            scope["principal"] = principal
+            if user is not None:
+                scope["user"] = user
         await self.app(scope, receive, send)
@@ -22,7 +22,8 @@ class RoundClass(Enum):
 
 class GameOrm(BaseOrmModel):
     name = fields.CharField(255)
-    code = fields.CharField(4, unique=True)
+    # Null once the game is over and its code has been recycled
+    code = fields.CharField(4, unique=True, null=True)
     owner = fields.ForeignKeyField("models.UserOrm", related_name="games")
     max_teams = fields.IntField()
     max_players_per_team = fields.IntField()
@@ -58,6 +59,12 @@ class RoundOrm(BaseOrmModel):
     class_ = fields.CharEnumField(RoundClass, source_field="class")
     ordinal = fields.IntField()
 
+    # Progress counters kept up as actions are saved. Null until they are
+    # first rebuilt from the action tables.
+    num_tiles = fields.IntField(null=True)
+    num_choices = fields.IntField(null=True)
+    num_responses = fields.IntField(null=True)
+
     class Meta:
         table = "rounds"
         unique_together = (("game", "class_"))
@@ -81,6 +88,9 @@ class BoardOrm(BaseOrmModel):
         default=5,
         source_field="tiles_per_category"
     )
+    # JSON list of the points of each tile position from the top of a
+    # category down. Null for the standard ladder of the round's class.
+    point_ladder = fields.TextField(null=True)
 
     class Meta:
         table = "boards"
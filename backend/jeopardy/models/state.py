@@ -0,0 +1,20 @@
+from tortoise import fields
+
+from jeopardy.models.base import BaseOrmModel
+
+
+class GameStateOrm(BaseOrmModel):
+    game = fields.OneToOneField(
+        "models.GameOrm",
+        related_name="state",
+        on_delete="CASCADE",
+    )
+    message_id = fields.BigIntField(null=True)
+    full = fields.TextField(null=True)
+    partial = fields.TextField(null=True)
+
+    class Meta:
+        table = "game_states"
+
+    def __str__(self):
+        return f"GameState({self.id}, {self.game_id}, {self.message_id})"
@@ -4,11 +4,17 @@ from jeopardy.models.base import BaseOrmModel
 
 
 class UserTokenOrm(BaseOrmModel):
+    """Token issued to a user, identified by its "jti" claim.
+
+    Tokens are only stored once they are revoked, as inactive rows. Guests'
+    tokens have no user.
+    """
     value = fields.CharField(255, source_field="token", unique=True)
     user = fields.ForeignKeyField(
-        "models.UserTokenOrm",
-        related_name="token",
+        "models.UserOrm",
+        related_name="tokens",
         on_delete="CASCADE",
+        null=True,
     )
     is_active = fields.BooleanField(default=1)
     expire_seconds = fields.IntField(default=3600)
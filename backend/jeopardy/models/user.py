@@ -15,6 +15,7 @@ class AuthProvider(Enum):
 
 class AnonymousUserMetadataOrm(BaseOrmModel):
     expire_seconds = fields.IntField(default=8*3600)
+    guest_id = fields.CharField(32, unique=True, null=True)
 
     class Meta:
         table = "user_metadata_anonymous"
@@ -3,9 +3,17 @@ import random
 from typing import Collection
 from typing import Optional
 
+from tortoise.expressions import F
 from tortoise.functions import Count
+from tortoise.transactions import in_transaction
 
+from jeopardy import boards
+from jeopardy import codes
 from jeopardy import exceptions
+from jeopardy import progress as round_progress
+from jeopardy import state
+from jeopardy.context import ActionContext
+from jeopardy.broadcast import hub
 from jeopardy.models.action import ActionOrmModel
 from jeopardy.models.action import ActionType
 from jeopardy.models.action import NoAction
@@ -24,19 +32,41 @@ from jeopardy.models.user import UserOrm
 from jeopardy.parse import action_orm_from_type
 from jeopardy.parse import parse_game_code
 from jeopardy.schema.action import Action
+from jeopardy.schema.action import Request
 from jeopardy.validation import is_round_over
 from jeopardy.validation import is_valid_game_code
+from jeopardy.validation import validate_game
+from jeopardy.validation import validate_request
+from jeopardy.validation import validate_user
 
 
-async def game_from_code(raw_game_code: str) -> GameOrm:
-    """Validate the input code and retrieve the associated GameOrm."""
+async def game_ref_from_code(raw_game_code: str) -> codes.GameRef:
+    """Validate the input code and find the game's id, status and owner."""
     if not is_valid_game_code(raw_game_code):
         raise exceptions.ForbiddenAccessException
 
     game_code = parse_game_code(raw_game_code)
-    game = await GameOrm.get_or_none(code=game_code)
+    game_ref = await codes.resolve(game_code)
+
+    if game_ref is None:
+        raise exceptions.ForbiddenAccessException
+
+    return game_ref
+
+
+async def game_id_from_code(raw_game_code: str) -> int:
+    """Validate the input code and find the id of the associated game."""
+    game_id, _, _ = await game_ref_from_code(raw_game_code)
+    return game_id
+
+
+async def game_from_code(raw_game_code: str) -> GameOrm:
+    """Validate the input code and retrieve the associated GameOrm."""
+    game_id = await game_id_from_code(raw_game_code)
+    game = await GameOrm.get_or_none(id=game_id)
 
     if game is None:
+        codes.forget(parse_game_code(raw_game_code))
         raise exceptions.ForbiddenAccessException
 
     return game
@@ -44,12 +74,20 @@ async def game_from_code(raw_game_code: str) -> GameOrm:
 
 async def start(game: GameOrm) -> None:
     """Create teams and allow users to start joining a game."""
-    game.status = GameStatus.JOINABLE
-    await game.save()
+    async with in_transaction():
+        await _advance_next_message_id(game)
+        game.status = GameStatus.JOINABLE
+
+        team_names = ["Elf", "Goblin", "Ogre", "Troll", "Wizard"]
+        for i in range(game.max_teams):
+            await TeamOrm.create(game=game, name=f"Team {team_names[i]}")
+
+        await game.save()
 
-    team_names = ["Elf", "Goblin", "Ogre", "Troll", "Wizard"]
-    for i in range(game.max_teams):
-        await TeamOrm.create(game=game, name=f"Team {team_names[i]}")
+    # The boards can't change from here on, so read them in once
+    await boards.build(game)
+    codes.remember(game)
+    await _publish(game)
 
 
 async def assign(
@@ -77,14 +115,18 @@ async def assign(
     if len(teams) == 0:
         raise exceptions.TeamAtMaxCapacityException
 
-    # Remove user from old team if on one
-    if current_team is not None:
-        await current_team.players.remove(user)
-
-    # Assign user to new team
     new_team = random.choice(teams)
-    await new_team.players.add(user)
+    async with in_transaction():
+        await _advance_next_message_id(game)
+
+        # Remove user from old team if on one
+        if current_team is not None:
+            await current_team.players.remove(user)
+
+        # Assign user to new team
+        await new_team.players.add(user)
 
+    await _publish(game)
     return new_team
 
 
@@ -135,12 +177,8 @@ async def _buzz_or_choice_if_tiles_available(
 ) -> ActionType:
     """Helper for determining next action type."""
     if await _all_teams_have_response(prev_action):
-        tiles_available = (
-            await TileOrm
-            .filter(category__board__round_=await prev_action.round_)
-            .filter(choices__id=None)
-            .count()
-        )
+        progress = await round_progress.load(await prev_action.round_)
+        tiles_available = progress["num_tiles"] - progress["num_choices"]
         if tiles_available:
             next_action_type = ActionType.CHOICE
         else:
@@ -184,58 +222,127 @@ async def _collect_wagers(prev_action: ActionOrmModel) -> ActionType:
     return next_action_type
 
 
-async def perform(game: GameOrm, player: UserOrm, action: Action):
-    """Update the game by performing the action."""
-    # Store action in database
-    action_orm = await _save_action_in_database(game, player, action)
-
-    # Update state to reveal more information
-    round_ = await game.next_round
-    for detail in _detail_revealed(action.type_, action.tile.is_daily_double):
-        await RoundRevealOrm.create(
-            round_=round_,
-            level=BoardLevel.TILE,
-            level_id=action.tile.id,
-            detail=detail,
-        )
+async def act(game: GameOrm, player: UserOrm, request: Request) -> None:
+    """Validate the player's request and update the game by performing it."""
+    await validate_game(game)
+    context = await ActionContext.load(game, player, request.action.tile_id)
+    await validate_user(game, player, context)
+    await validate_request(game, player, request, context)
+    await perform(game, player, request.action, context)
 
-    # Update next_chooser, next_round, and team score
-    if action.type_ == ActionType.RESPONSE:
-        team = await player.team(game)
-        tile_value = await _tile_value(game, team, action.tile)
 
-        if action_orm.is_correct:
-            game.next_chooser = team
-            team.score += tile_value
-        else:
-            team.score -= tile_value
-        await team.save()
+async def perform(
+    game: GameOrm,
+    player: UserOrm,
+    action: Action,
+    context: Optional[ActionContext] = None,
+):
+    """Update the game by performing the action."""
+    if context is None:
+        context = await ActionContext.load(game, player, action.tile_id)
 
-        if await is_round_over(round_):
-            game.next_round = await _next_round(round_)
+    async with in_transaction():
+        # Claim the next message before changing anything else, so that
+        # only one of several concurrent requests can perform its action
+        await _claim_next_message_id(game)
 
-            # New round means lowest-scoring team gets to choose
-            teams = await game.teams
-            teams.sort(key=lambda x: x.score)
-            lowest_scoring_team = teams[0]
-            game.next_chooser = lowest_scoring_team
+        # Store action in database
+        action_orm = await _save_action_in_database(
+            game, player, action, context
+        )
 
-    # Update next_action_type
-    next_action_type = await next_round_action_type(action_orm)
-    if all((
-        game.next_round is not None,             # game isn't over, but
-        game.next_round != round_,               # round has changed
-        isinstance(next_action_type, NoAction),  # because last round ended
-    )):
-        next_action_type = await next_round_action_type(next_action_type)
-    if isinstance(next_action_type, NoAction):   # game is over
-        next_action_type = None
-    game.next_action_type = next_action_type
+        # Update state to reveal more information
+        round_ = context.round_
+        is_daily_double = context.tile.is_daily_double
+        for detail in _detail_revealed(action.type_, is_daily_double):
+            await RoundRevealOrm.create(
+                round_=round_,
+                level=BoardLevel.TILE,
+                level_id=context.tile.id,
+                detail=detail,
+            )
+
+        # Update next_chooser, next_round, and team score
+        if action.type_ == ActionType.RESPONSE:
+            team = context.team
+            tile_value = await _tile_value(game, team, context.tile, round_)
+
+            if action_orm.is_correct:
+                game.next_chooser = team
+                team.score += tile_value
+            else:
+                team.score -= tile_value
+            await team.save()
+
+            if await is_round_over(round_):
+                game.next_round = await _next_round(round_)
+
+                # New round means lowest-scoring team gets to choose
+                teams = await game.teams
+                teams.sort(key=lambda x: x.score)
+                lowest_scoring_team = teams[0]
+                game.next_chooser = lowest_scoring_team
+
+        # Update next_action_type
+        next_action_type = await next_round_action_type(action_orm)
+        if all((
+            game.next_round is not None,             # game isn't over, but
+            game.next_round != round_,               # round has changed
+            isinstance(next_action_type, NoAction),  # because round ended
+        )):
+            next_action_type = await next_round_action_type(next_action_type)
+        if isinstance(next_action_type, NoAction):   # game is over
+            next_action_type = None
+            game.status = GameStatus.FINISHED
+        game.next_action_type = next_action_type
+
+        await game.save()
+
+    if game.status == GameStatus.FINISHED:
+        codes.remember(game)
+    await _publish(game)
+
+
+async def _claim_next_message_id(game: GameOrm) -> None:
+    """Atomically move the game on to its next message.
+
+    The update only succeeds if no other request has already moved the game
+    past the message id this game object was loaded with.
+    """
+    message_id = game.next_message_id
+    if message_id is None:
+        games = GameOrm.filter(id=game.id, next_message_id__isnull=True)
+    else:
+        games = GameOrm.filter(id=game.id, next_message_id=message_id)
+
+    next_message_id = (message_id or 0) + 1
+    is_claimed = await games.update(next_message_id=next_message_id)
+    if not is_claimed:
+        raise exceptions.InvalidRequestException
+    game.next_message_id = next_message_id
+
+
+async def _advance_next_message_id(game: GameOrm) -> None:
+    """Atomically move the game on to its next message, whichever it's at.
+
+    Joins and starts don't answer a particular message, so instead of
+    failing when another request has moved the game on first, they take the
+    message after it. Inside a transaction the game's row stays locked until
+    commit, so the id read back is this request's own.
+    """
+    games = GameOrm.filter(id=game.id)
+    if game.next_message_id is None:
+        await games.filter(next_message_id__isnull=True).update(
+            next_message_id=0
+        )
+    await games.update(next_message_id=F("next_message_id") + 1)
+    game.next_message_id = await state.message_id(game.id)
 
-    # Update next_message_id
-    game.next_message_id += 1
 
-    await game.save()
+async def _publish(game: GameOrm) -> None:
+    """Snapshot the state of the game and send it to connected players."""
+    views = await state.save_views(game)
+    await hub.publish(game.id, views)
 
 
 def _detail_revealed(
@@ -273,16 +380,17 @@ async def _next_round(round_: RoundOrm) -> Optional[RoundOrm]:
 
 
 async def _save_action_in_database(
-    game: GameOrm, player: UserOrm, action: Action
+    game: GameOrm, player: UserOrm, action: Action, context: ActionContext
 ) -> ActionOrmModel:
     """Helper for perform."""
     action_orm_class = action_orm_from_type(action.type_)
-    tile = await action.tile
-    team = await player.team(game)
+    tile = context.tile
+    team = context.team
 
     if action.type_ == ActionType.RESPONSE:
         # TODO: Separate into an is_correct(response) function in validation.py
-        is_correct = (await tile.trivia).question == action.question
+        content = await boards.load(context.round_.id)
+        is_correct = content.tile(tile.id).question == action.question
         action_orm = await action_orm_class.create(
             game=game, tile=tile, team=team, user=player, is_correct=is_correct
         )
@@ -295,12 +403,16 @@ async def _save_action_in_database(
             game=game, tile=tile, team=team, user=player
         )
 
+    # Spare next_round_action_type from walking back up to the round
+    action_orm.round_ = context.round_
+    await round_progress.record(context.round_, action.type_)
     return action_orm
 
 
-async def _tile_value(game: GameOrm, team: TeamOrm, tile: TileOrm) -> int:
+async def _tile_value(
+    game: GameOrm, team: TeamOrm, tile: TileOrm, round_: RoundOrm
+) -> int:
     """Helper for perform."""
-    round_ = await tile.round_
     # Daily double tile or final jeopardy round
     if tile.is_daily_double or round_.class_ == RoundClass.FINAL:
         wager = await WagerOrm.get(team=team, tile=tile, game=game)
@@ -308,17 +420,7 @@ async def _tile_value(game: GameOrm, team: TeamOrm, tile: TileOrm) -> int:
 
     # Normal tile in single or double jeopardy round
     else:
-        if round_.class_ == RoundClass.SINGLE:
-            multiplier = 200
-        elif round_.class_ == RoundClass.DOUBLE:
-            multiplier = 400
-
-        await tile.fetch_related("category__tiles")
-        category_tiles = list(tile.category.tiles)
-        category_tiles.sort(key=lambda x: x.ordinal)
-        for position, category_tile in enumerate(category_tiles):
-            if category_tile.id == tile.id:
-                break
-        value = multiplier * (position + 1)
+        content = await boards.load(round_.id)
+        value = content.place(tile.id).points
 
     return value
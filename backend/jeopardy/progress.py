@@ -0,0 +1,104 @@
+"""Per-round counters of tiles, choices and responses.
+
+The counters are stored on the round and bumped in the same transaction that
+saves each action, so checking whether a round is over or whether any tiles
+are left to choose is a single read of the round instead of counting joins
+across the board. Counters start out null and are rebuilt from the action
+tables the first time they are read.
+"""
+from typing import Dict
+
+from tortoise.expressions import F
+
+from jeopardy import boards
+from jeopardy.models.action import ActionType
+from jeopardy.models.action import ChoiceOrm
+from jeopardy.models.action import ResponseOrm
+from jeopardy.models.game import RoundOrm
+
+
+Progress = Dict[str, int]
+
+FIELDS = ("num_tiles", "num_choices", "num_responses")
+
+_COUNTED_ACTIONS = {
+    ActionType.CHOICE: "num_choices",
+    ActionType.RESPONSE: "num_responses",
+}
+
+
+async def load(round_: RoundOrm) -> Progress:
+    """Read the round's progress, rebuilding it if it was never counted."""
+    progress = (await RoundOrm.filter(id=round_.id).values(*FIELDS))[0]
+    if None in progress.values():
+        progress = await rebuild(round_)
+    return progress
+
+
+async def rebuild(round_: RoundOrm) -> Progress:
+    """Recount the round's progress from the action tables and store it."""
+    progress = await count(round_)
+    await RoundOrm.filter(id=round_.id).update(**progress)
+    return progress
+
+
+async def is_consistent(round_: RoundOrm) -> bool:
+    """Check the round's stored progress against the action tables.
+
+    Rounds that haven't been counted yet are consistent, since their progress
+    is rebuilt when it is first read.
+    """
+    stored = (await RoundOrm.filter(id=round_.id).values(*FIELDS))[0]
+    if None in stored.values():
+        return True
+    return stored == await count(round_)
+
+
+async def record(round_: RoundOrm, action_type: ActionType) -> None:
+    """Count a newly saved action towards the round's progress."""
+    field = _COUNTED_ACTIONS.get(action_type)
+    if field is None:
+        return
+
+    # Uncounted rounds pick the action up when they are rebuilt
+    await (
+        RoundOrm
+        .filter(id=round_.id)
+        .filter(**{f"{field}__not_isnull": True})
+        .update(**{field: F(field) + 1})
+    )
+
+
+async def count(round_: RoundOrm) -> Progress:
+    """Count the round's tiles, choices and responses."""
+    return {
+        "num_tiles": await _num_tiles(round_),
+        "num_choices": await _num_choices(round_),
+        "num_responses": await _num_responses(round_),
+    }
+
+
+async def _num_tiles(round_: RoundOrm) -> int:
+    """Helper for count."""
+    content = await boards.load(round_.id)
+    return 0 if content is None else content.num_tiles
+
+
+async def _num_choices(round_: RoundOrm) -> int:
+    """Helper for count."""
+    return (
+        await ChoiceOrm
+        .filter(game__id=round_.game_id)
+        .filter(tile__category__board__round__id=round_.id)
+        .count()
+    )
+
+
+async def _num_responses(round_: RoundOrm) -> int:
+    """Helper for count."""
+    return (
+        await ResponseOrm
+        .filter(game__id=round_.game_id)
+        .filter(tile__category__board__round__id=round_.id)
+        .count()
+    )
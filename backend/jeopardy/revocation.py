@@ -0,0 +1,89 @@
+"""Revoked user tokens, checked in memory.
+
+Revoking a token stores its id in the user_tokens table. Each worker keeps the
+ids of revoked tokens that haven't expired yet in a set, which it reloads from
+the table in the background, so checking a token never waits on the database.
+A token revoked by another worker is rejected here after the next refresh.
+"""
+import asyncio
+import logging
+from datetime import datetime
+from datetime import timedelta
+from typing import Optional
+from typing import Set
+
+from jeopardy.models.token import UserTokenOrm
+
+
+class RevocationList:
+    def __init__(self, refresh_seconds: float = 30, max_age: float = 3600):
+        self.refresh_seconds = refresh_seconds
+        self.max_age = max_age
+        self._revoked: Set[str] = set()
+        # Tokens revoked here while a refresh is loading, if one is
+        self._revoked_since_refresh: Optional[Set[str]] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def is_revoked(self, token_id: Optional[str]) -> bool:
+        return token_id in self._revoked
+
+    async def revoke(
+        self, token_id: str, user_id: Optional[int], expire_seconds: int
+    ) -> None:
+        """Revoke the token for the rest of its lifetime.
+
+        Tokens are told apart by id alone, so guests' tokens, which have no
+        user, are revoked without one.
+        """
+        self._revoked.add(token_id)
+        if self._revoked_since_refresh is not None:
+            self._revoked_since_refresh.add(token_id)
+        await UserTokenOrm.get_or_create(
+            value=token_id,
+            defaults={
+                "user_id": user_id,
+                "is_active": False,
+                "expire_seconds": max(expire_seconds, 0),
+            },
+        )
+
+    async def refresh(self) -> None:
+        """Reload the revoked tokens that could still be unexpired.
+
+        Tokens never live longer than max_age, so revocations older than that
+        are dropped from the table as well. Tokens revoked here while the
+        query runs may be missing from its results, so they're kept too.
+        """
+        oldest = datetime.utcnow() - timedelta(seconds=self.max_age)
+        self._revoked_since_refresh = set()
+        try:
+            revoked = (
+                await UserTokenOrm
+                .filter(is_active=False, created_ts__gte=oldest)
+                .values_list("value", flat=True)
+            )
+            self._revoked = set(revoked) | self._revoked_since_refresh
+        finally:
+            self._revoked_since_refresh = None
+        await UserTokenOrm.filter(created_ts__lt=oldest).delete()
+
+    def start(self) -> None:
+        """Keep refreshing the revoked tokens in the background."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception:
+                logging.exception("Failed to refresh revoked tokens")
+            await asyncio.sleep(self.refresh_seconds)
+
+
+revocations = RevocationList()
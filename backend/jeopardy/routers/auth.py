@@ -2,6 +2,7 @@ from fastapi import APIRouter
 from fastapi import Request
 from starlette.responses import RedirectResponse
 
+from jeopardy.auth import login_guest
 from jeopardy.auth import login_user
 from jeopardy.auth import logout_user
 from jeopardy.auth import oauth
@@ -19,6 +20,13 @@ async def login(request: Request, next: str = "home"):
     return await oauth.google.authorize_redirect(request, callback_url)
 
 
+@router.api_route("/guest")
+async def guest(next: str = "home"):
+    response = RedirectResponse(url=f"/?next={next}", status_code=302)
+    await login_guest(response)
+    return response
+
+
 @router.api_route("/oauth2callback")
 async def callback(request: Request):
     token = await oauth.google.authorize_access_token(request)
@@ -33,7 +41,7 @@ async def callback(request: Request):
 
 
 @router.api_route("/logout")
-async def logout():
+async def logout(request: Request):
     response = RedirectResponse(url=f"/?next=home", status_code=302)
-    await logout_user(response)
+    await logout_user(response, request.cookies.get("user"))
     return response
@@ -2,8 +2,11 @@ from typing import Mapping
 
 from fastapi import APIRouter
 from fastapi import Depends
+from fastapi import HTTPException
+from fastapi import status
 
 from jeopardy import create
+from jeopardy import exceptions
 from jeopardy.auth import current_user
 from jeopardy.models.user import UserOrm
 from jeopardy.schema.state import Game
@@ -19,10 +22,16 @@ async def create_game(
     user: UserOrm = Depends(current_user),
 ) -> Mapping:
     """Create a new game."""
-    new_game = await create.game(
-        owner=user,
-        name="Untitled Game",
-        max_teams=max_teams,
-        max_players_per_team=max_players_per_team,
-    )
+    try:
+        new_game = await create.game(
+            owner=user,
+            name="Untitled Game",
+            max_teams=max_teams,
+            max_players_per_team=max_players_per_team,
+        )
+    except exceptions.GameCodesExhaustedException:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Every game code is in use. Please try again later.",
+        )
     return new_game.dict()
@@ -1,51 +1,141 @@
 import logging
-from typing import Mapping
+from typing import Optional
 
 from fastapi import APIRouter
 from fastapi import Depends
+from fastapi import Request
+from fastapi import Response
 from fastapi import status
 from starlette.websockets import WebSocket
+from starlette.websockets import WebSocketDisconnect
 
+from jeopardy import codes
 from jeopardy import exceptions
+from jeopardy import frames
 from jeopardy import state
+from jeopardy.auth import current_principal
 from jeopardy.auth import current_user
+from jeopardy.broadcast import hub
+from jeopardy.frames import View
+from jeopardy.models.action import ActionType
 from jeopardy.models.game import GameOrm
 from jeopardy.models.game import GameStatus
 from jeopardy.models.user import UserOrm
+from jeopardy.parse import parse_request
+from jeopardy.play import act
 from jeopardy.play import assign
 from jeopardy.play import game_from_code
+from jeopardy.play import game_ref_from_code
 from jeopardy.play import start
+from jeopardy.schema.state import Audience
+from jeopardy.schema.user import Principal
 from jeopardy.validation import is_active_game
 
 
 router = APIRouter()
 
+LONG_POLL_SECONDS = 25
+
 
 @router.get("/game/{raw_game_code}")
-async def get_game(game: GameOrm = Depends(game_from_code)) -> Mapping:
-    return (await state.full(game)).dict()
+async def get_game(
+    request: Request,
+    raw_game_code: str,
+    after: Optional[int] = None,
+    game_ref: codes.GameRef = Depends(game_ref_from_code),
+    principal: Principal = Depends(current_principal),
+) -> Response:
+    """Send the state of the game, unless the client's copy is current.
+
+    Clients that send back the ETag of their copy in If-None-Match get an
+    empty 304 while the game hasn't moved on, after only looking up the
+    game's message id.
+
+    Clients that can't keep a websocket open can long poll instead, by
+    passing the message id of their copy as `after`. The request then waits
+    until the game moves past that message, or LONG_POLL_SECONDS pass.
+    """
+    game_id, _, owner_id = game_ref
+    audience = _audience(principal, owner_id, Audience.SPECTATOR)
+    if after is not None:
+        if (await state.message_id(game_id) or 0) <= after:
+            views = await hub.wait(game_id, after, LONG_POLL_SECONDS)
+            if views is not None:
+                return _state_response(game_id, views[audience], audience)
+
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match is not None:
+        etag = frames.etag(
+            game_id, await state.message_id(game_id), audience
+        )
+        if frames.etag_matches(if_none_match, etag):
+            return _not_modified(etag)
+
+    view = await state.current_by_id(game_id, audience)
+    return _state_response(game_id, view, audience)
 
 
 @router.post("/start/{raw_game_code}")
-async def start_game(game: GameOrm = Depends(game_from_code)) -> Mapping:
+async def start_game(
+    request: Request,
+    game: GameOrm = Depends(game_from_code),
+    principal: Principal = Depends(current_principal),
+) -> Response:
     """Allow users to start joining a game."""
+    audience = _audience(principal, game.owner_id, Audience.SPECTATOR)
     if game.status == GameStatus.EDITABLE:
         await start(game)
-    return (await state.full(game)).dict()
+    else:
+        # Nothing changes for a game that's already started
+        etag = frames.etag(game.id, game.next_message_id, audience)
+        if frames.etag_matches(request.headers.get("If-None-Match"), etag):
+            return _not_modified(etag)
+
+    view = await state.current(game, audience)
+    return _state_response(game.id, view, audience)
+
+
+def _audience(
+    principal: Principal, owner_id: int, otherwise: Audience
+) -> Audience:
+    """The game's owner hosts it, and sees the trivia before it's revealed."""
+    if principal.id is not None and principal.id == owner_id:
+        return Audience.HOST
+    return otherwise
+
+
+def _state_response(game_id: int, view: View, audience: Audience) -> Response:
+    """Helper for get_game and start_game."""
+    return Response(
+        view.body,
+        media_type="application/json",
+        headers={
+            "ETag": frames.etag(game_id, view.message_id, audience),
+            # Let browsers keep the state, but check it on every poll
+            "Cache-Control": "no-cache",
+        },
+    )
+
+
+def _not_modified(etag: str) -> Response:
+    """Helper for get_game and start_game."""
+    return Response(
+        status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"}
+    )
 
 
 @router.websocket("/play/{game_code}")
 async def play(
     websocket: WebSocket,
     game_code: str,
-    user: UserOrm = Depends(current_user),
+    principal: Principal = Depends(current_principal),
 ) -> None:
     logging.info(f"New user attempting to connect to game: {game_code}")
     await websocket.accept()
     frontend_endpoint = f"play.{game_code}"
 
     # Check authentication
-    if not user.is_active:
+    if not principal.is_active:
         redirect_to_login = {
             "status_code": 302,
             "redirect_url": f"/user/login?next={frontend_endpoint}",
@@ -68,21 +158,69 @@ async def play(
         await websocket.close()
         return
 
-    # Assign to team
-    team_state = await state.full(game)
-    team_state.display.level = "team"
-    await websocket.send_json(team_state.json())
+    audience = _audience(principal, game.owner_id, Audience.PLAYER)
 
-    while True:
-        data = await websocket.receive_json()
-        if data["action"]["type"] == "join":
-            team_name = data["action"]["team"]
-            await assign(game, user, team_name)
+    # Send current state, then changes as they happen
+    view = await state.current(game, audience)
+    await websocket.send_text(frames.snapshot(view).decode("utf-8"))
+    hub.subscribe(game.id, websocket, audience)
 
-        team_state = await state.full(game)
-        team_state.display.level = "team"
-        await websocket.send_json(team_state.json())
-
-    while True:
-        data = await websocket.receive_json()
-        await websocket.send_json(data)
+    # Handle joins and actions until the user leaves
+    try:
+        while True:
+            data = await websocket.receive_json()
+            action_type = data["action"]["type"]
+            try:
+                if action_type == "sync":
+                    # Client missed a change, so resend the full state
+                    game = await GameOrm.get(id=game.id)
+                    view = await state.current(game, audience)
+                    await websocket.send_text(
+                        frames.snapshot(view).decode("utf-8")
+                    )
+
+                elif action_type == "join":
+                    user = await _player(websocket)
+                    team_name = data["action"]["team"]
+                    # Other connections may have advanced the game meanwhile
+                    game = await GameOrm.get(id=game.id)
+                    await assign(game, user, team_name)
+
+                elif ActionType.from_value(action_type) is not None:
+                    request = parse_request(
+                        ActionType.from_value(action_type), data
+                    )
+                    user = await _player(websocket)
+                    game = await GameOrm.get(id=game.id)
+                    await act(game, user, request)
+
+                else:
+                    raise exceptions.InvalidRequestException(
+                        f"Unknown action type: {action_type}"
+                    )
+
+            except (
+                exceptions.ForbiddenAccessException,
+                exceptions.InvalidRequestException,
+            ) as exc:
+                invalid_request_response = {
+                    "status_code": 400,
+                    "message": str(exc) or exc.__class__.__name__,
+                }
+                await websocket.send_json(invalid_request_response)
+
+    except WebSocketDisconnect:
+        logging.info(f"User disconnected from game: {game_code}")
+    finally:
+        hub.unsubscribe(game.id, websocket)
+
+
+async def _player(websocket: WebSocket) -> UserOrm:
+    """Load the connected user, e.g. to join a team or act on a tile.
+
+    Guests only get a user the first time this is needed.
+    """
+    user = await current_user(websocket=websocket)
+    if not user.is_active:
+        raise exceptions.ForbiddenAccessException
+    return user
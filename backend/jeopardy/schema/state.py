@@ -1,3 +1,4 @@
+from enum import Enum
 from typing import List
 from typing import Optional
 
@@ -15,7 +16,8 @@ def cast_to_list(value) -> List:
 
 
 def first(value):
-    return value[0]
+    values = [x for x in value]
+    return values[0] if values else None
 
 
 def sorted_by_ordinal(value) -> List:
@@ -95,13 +97,19 @@ class Round(BaseModel):
     _board = validator("board", pre=True, allow_reuse=True)(first)
 
 
+class Audience(Enum):
+    HOST      = "host"
+    PLAYER    = "player"
+    SPECTATOR = "spectator"
+
+
 class Display(BaseModel):
     level: str = "game"
     id: Optional[int]
 
 
 class Game(BaseModel):
-    code: constr(min_length=4, max_length=4)
+    code: Optional[constr(min_length=4, max_length=4)]
     display: Display = Field(default_factory=Display)
     message_id: int = Field(alias="next_message_id")
     round_: Optional[Round] = Field(alias="next_round")
@@ -1,3 +1,4 @@
+from typing import List
 from typing import Optional
 
 from pydantic import BaseModel
@@ -30,3 +31,12 @@ class User(BaseModel):
     auth_provider: AuthProvider
     anonymous_metadata: Optional[AnonymousUserMetadata] = None
     google_metadata: Optional[GoogleUserMetadata] = None
+
+
+class Principal(BaseModel):
+    """Who a request or websocket connection is authenticated as."""
+    id: Optional[int] = None
+    is_active: bool = False
+    guest_id: Optional[str] = None
+    name: Optional[str] = None
+    scopes: List[str] = []
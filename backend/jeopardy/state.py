@@ -1,26 +1,347 @@
+import json
+from types import SimpleNamespace
+from typing import Any
+from typing import Dict
+from typing import FrozenSet
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Type
+from typing import TypeVar
+
+from pydantic import BaseModel
+
+from jeopardy import boards
+from jeopardy.cache import LRUCache
+from jeopardy.frames import View
 from jeopardy.models.game import GameOrm
-from jeopardy.models.game import RoundClass
+from jeopardy.models.reveals import BoardLevel
+from jeopardy.models.reveals import BoardLevelDetail
+from jeopardy.models.reveals import RoundRevealOrm
+from jeopardy.models.state import GameStateOrm
+from jeopardy.models.team import TeamOrm
+from jeopardy.schema.state import Audience
+from jeopardy.schema.state import Board
+from jeopardy.schema.state import Category
+from jeopardy.schema.state import Display
 from jeopardy.schema.state import Game
+from jeopardy.schema.state import Player
+from jeopardy.schema.state import Round
+from jeopardy.schema.state import Team
+from jeopardy.schema.state import Tile
+
+
+# Revealed details of the round's tiles, by tile id
+Reveals = FrozenSet[Tuple[int, BoardLevelDetail]]
+Views = Dict[Audience, View]
+Model = TypeVar("Model", bound=BaseModel)
+
+# Views by game id, message id and audience
+_views = LRUCache(maxsize=1024)
 
 
 async def full(game: GameOrm) -> Game:
     """Fetch the full current state of the game."""
-    # Fetch needed values from database
-    await game.fetch_related("teams__players")
-    await game.fetch_related("next_round__board__categories__tiles__trivia")
-    await game.fetch_related("next_chooser")
-
-    # Transform database orm to pydantic model
-    state = Game.from_orm(game)
-
-    # Set points for tiles in basic rounds
-    if state.round_.class_ != RoundClass.FINAL:
-        if state.round_.class_ == RoundClass.SINGLE:
-            multiplier = 200
-        else:
-            multiplier = 400
-        for category in state.round_.board.categories:
-            for position, tile in enumerate(category.tiles):
-                tile.points = multiplier * (position + 1)
-
-    return state
+    teams = await _teams(game)
+    content = None
+    if game.next_round_id is not None:
+        content = await boards.load(game.next_round_id)
+    return assemble(game, teams, content)
+
+
+def assemble(
+    game: GameOrm,
+    teams: List[SimpleNamespace],
+    content: Optional[boards.RoundContent],
+) -> Game:
+    """Lay out the state of the game from its rows without validating them.
+
+    The rows come from our own tables and the board is already in order, so
+    the models are constructed directly instead of going through
+    Game.from_orm and its validators. The result is the same either way.
+    """
+    round_ = None
+    if content is not None:
+        board = None
+        if content.num_categories is not None:
+            categories = [
+                _construct(
+                    Category,
+                    id=category.id,
+                    name=category.name,
+                    tiles=[
+                        _construct(
+                            Tile,
+                            id=tile.id,
+                            answer=tile.answer,
+                            question=tile.question,
+                            points=content.places[tile.id].points,
+                        )
+                        for tile in category.tiles
+                    ],
+                )
+                for category in content.categories
+            ]
+            board = _construct(
+                Board,
+                categories=categories,
+                num_categories=content.num_categories,
+            )
+        round_ = _construct(Round, class_=content.class_, board=board)
+
+    teams_ = [
+        _construct(
+            Team,
+            id=team.id,
+            has_pressed_buzzer=False,
+            name=team.name,
+            players=[
+                _construct(Player, id=x.id, username=x.username)
+                for x in team.players
+            ],
+        )
+        for team in teams
+    ]
+    next_chooser = next(
+        (x for x in teams if x.id == game.next_chooser_id), None
+    )
+
+    return _construct(
+        Game,
+        code=game.code,
+        display=_construct(Display, level="game", id=None),
+        message_id=game.next_message_id,
+        round_=round_,
+        team_that_chooses=getattr(next_chooser, "name", None),
+        teams=teams_,
+        status=game.status,
+    )
+
+
+def _construct(model: Type[Model], **values: Any) -> Model:
+    """Helper for assemble. Create the model from all of its field values.
+
+    Unlike BaseModel.construct, this doesn't deep copy the model's defaults
+    first, which took most of the time of assembling a state.
+    """
+    instance = model.__new__(model)
+    object.__setattr__(instance, "__dict__", values)
+    object.__setattr__(instance, "__fields_set__", set(values))
+    return instance
+
+
+async def _teams(game: GameOrm) -> List[SimpleNamespace]:
+    """Helper for full. Load all teams and players in a single query."""
+    rows = (
+        await TeamOrm
+        .filter(game_id=game.id)
+        .order_by("id")
+        .values(
+            "id",
+            "name",
+            player_id="players__id",
+            player_username="players__username",
+        )
+    )
+
+    teams = {}
+    for row in rows:
+        team = teams.setdefault(row["id"], SimpleNamespace(
+            id=row["id"], name=row["name"], players=[]
+        ))
+        if row["player_id"] is not None:
+            team.players.append(SimpleNamespace(
+                id=row["player_id"], username=row["player_username"]
+            ))
+
+    return list(teams.values())
+
+
+async def message_id(game_id: int) -> Optional[int]:
+    """Look up only the id of the game's latest message."""
+    message_ids = await (
+        GameOrm
+        .filter(id=game_id)
+        .values_list("next_message_id", flat=True)
+    )
+    return message_ids[0] if message_ids else None
+
+
+async def current(
+    game: GameOrm, audience: Audience = Audience.SPECTATOR
+) -> View:
+    """Fetch the audience's view of the current state from the snapshot.
+
+    The state is only rebuilt from the database when the snapshot is missing
+    or was taken before the game's latest message.
+    """
+    view = _views.get((game.id, game.next_message_id, audience))
+    if view is not None:
+        return view
+
+    snapshot = await GameStateOrm.get_or_none(game_id=game.id)
+    if snapshot is None or snapshot.full is None or snapshot.partial is None:
+        return await save(game, audience)
+
+    # A snapshot newer than the game object is still a valid current state
+    if (snapshot.message_id or 0) < (game.next_message_id or 0):
+        return await save(game, audience)
+
+    return _view(
+        game.id, snapshot.message_id, snapshot.full, snapshot.partial, audience
+    )
+
+
+async def current_by_id(
+    game_id: int, audience: Audience = Audience.SPECTATOR
+) -> View:
+    """Fetch the audience's view of the current state of the game with the id.
+
+    The snapshot and the game's latest message id are read together, so that
+    serving an up to date snapshot takes a single query.
+    """
+    snapshots = await GameStateOrm.filter(game_id=game_id).values(
+        "message_id",
+        "full",
+        "partial",
+        next_message_id="game__next_message_id",
+    )
+    if len(snapshots) > 0:
+        snapshot = snapshots[0]
+        is_current = (
+            (snapshot["message_id"] or 0) >= (snapshot["next_message_id"] or 0)
+        )
+        is_complete = None not in (snapshot["full"], snapshot["partial"])
+        if is_complete and is_current:
+            return _view(
+                game_id,
+                snapshot["message_id"],
+                snapshot["full"],
+                snapshot["partial"],
+                audience,
+            )
+
+    return await current(await GameOrm.get(id=game_id), audience)
+
+
+async def save(
+    game: GameOrm, audience: Audience = Audience.SPECTATOR
+) -> View:
+    """Rebuild the state of the game and store it as the game's snapshot."""
+    return (await save_views(game))[audience]
+
+
+async def save_views(game: GameOrm) -> Views:
+    """Rebuild the state of the game, store it, and render every view of it.
+
+    The snapshot keeps the whole state, with everything the host sees, and
+    the partial state that everyone else sees, with the trivia of the round
+    redacted down to what has been revealed.
+    """
+    serialized = (await full(game)).json()
+    full_state = json.loads(serialized)
+    partial_state = redact(full_state, await _reveals(game))
+    serialized_partial = json.dumps(partial_state)
+
+    updated = await GameStateOrm.filter(game_id=game.id).update(
+        message_id=game.next_message_id,
+        full=serialized,
+        partial=serialized_partial,
+    )
+    if not updated:
+        await GameStateOrm.create(
+            game=game,
+            message_id=game.next_message_id,
+            full=serialized,
+            partial=serialized_partial,
+        )
+
+    return _keep(
+        game.id, game.next_message_id, render(full_state, partial_state)
+    )
+
+
+def redact(game_state: Dict, reveals: Reveals) -> Dict:
+    """Hide the answers and questions of tiles that haven't been revealed.
+
+    Only the parts of the state that change are copied, and the rest is
+    shared with the original.
+    """
+    round_ = game_state.get("round_")
+    if round_ is None or round_.get("board") is None:
+        return game_state
+
+    categories = []
+    for category in round_["board"]["categories"]:
+        tiles = []
+        for tile in category["tiles"]:
+            tile = dict(tile)
+            if (tile["id"], BoardLevelDetail.ANSWER) not in reveals:
+                tile["answer"] = None
+            if (tile["id"], BoardLevelDetail.QUESTION) not in reveals:
+                tile["question"] = None
+            tiles.append(tile)
+        categories.append({**category, "tiles": tiles})
+
+    board = {**round_["board"], "categories": categories}
+    return {**game_state, "round_": {**round_, "board": board}}
+
+
+def render(full_state: Dict, partial_state: Dict) -> Dict[Audience, Dict]:
+    """Lay out the view of each audience from the whole and partial state.
+
+    The host sees everything. Players and spectators see the partial state,
+    and players, like the host, get the team display to join and play from.
+    """
+    return {
+        Audience.HOST: _with_display_level(full_state, "team"),
+        Audience.PLAYER: _with_display_level(partial_state, "team"),
+        Audience.SPECTATOR: partial_state,
+    }
+
+
+def _view(
+    game_id: int,
+    message_id: Optional[int],
+    serialized_full: str,
+    serialized_partial: str,
+    audience: Audience,
+) -> View:
+    """Helper for current. Render the snapshot's views once per message."""
+    view = _views.get((game_id, message_id, audience))
+    if view is None:
+        states = render(
+            json.loads(serialized_full), json.loads(serialized_partial)
+        )
+        view = _keep(game_id, message_id, states)[audience]
+    return view
+
+
+def _keep(
+    game_id: int, message_id: Optional[int], states: Dict[Audience, Dict]
+) -> Views:
+    """Helper for current and save_views. Cache the views of a message."""
+    views = {audience: View(state) for audience, state in states.items()}
+    for audience, view in views.items():
+        _views.set((game_id, message_id, audience), view)
+    return views
+
+
+def _with_display_level(game_state: Dict, level: str) -> Dict:
+    """Helper for render."""
+    return {**game_state, "display": {**game_state["display"], "level": level}}
+
+
+async def _reveals(game: GameOrm) -> Reveals:
+    """Helper for save_views. Load the round's reveals in a single query."""
+    if game.next_round_id is None:
+        return frozenset()
+
+    rows = (
+        await RoundRevealOrm
+        .filter(round__id=game.next_round_id, level=BoardLevel.TILE)
+        .values_list("level_id", "detail")
+    )
+    return frozenset(
+        (tile_id, BoardLevelDetail(detail)) for tile_id, detail in rows
+    )
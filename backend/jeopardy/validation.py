@@ -1,13 +1,12 @@
 from typing import Optional
 
 from jeopardy import exceptions
+from jeopardy import progress as round_progress
+from jeopardy.context import ActionContext
 from jeopardy.models.action import ActionType
-from jeopardy.models.action import ChoiceOrm
-from jeopardy.models.action import ResponseOrm
 from jeopardy.models.game import GameOrm
 from jeopardy.models.game import GameStatus
 from jeopardy.models.game import RoundClass
-from jeopardy.models.game import RoundOrm
 from jeopardy.models.game import TileOrm
 from jeopardy.models.team import TeamOrm
 from jeopardy.models.user import UserOrm
@@ -25,7 +24,9 @@ async def is_active_game(game: GameOrm) -> bool:
     return game.status in active_statuses
 
 
-async def is_player(game: GameOrm, user: UserOrm) -> bool:
+async def is_player(
+    game: GameOrm, user: UserOrm, context: Optional[ActionContext] = None
+) -> bool:
     """Confirm that the user is a participant of the game.
 
     This holds when the player is an active user and a member of a team in the
@@ -34,20 +35,29 @@ async def is_player(game: GameOrm, user: UserOrm) -> bool:
     if not user.is_active:
         return False
 
-    team = await user.team(game)
+    if context is None:
+        team = await user.team(game)
+    else:
+        team = context.team
     return team is not None
 
 
 async def is_permitted_to_act(
-    game: GameOrm, player: UserOrm, action_type: ActionType, tile: TileOrm
+    game: GameOrm,
+    player: UserOrm,
+    action_type: ActionType,
+    tile: TileOrm,
+    context: Optional[ActionContext] = None,
 ) -> bool:
     """Determine if chosen player is allowed to perform the next action.
 
     It is assumed that the player is already part of a team involved with the
     game, that the game is active, and that the action is a valid next action.
     """
-    team = await player.team(game)
-    round_ = await tile.category.board.round_
+    if context is None:
+        context = await ActionContext.load(game, player, tile.id)
+    team = context.team
+    round_ = context.round_
 
     if round_.class_ == RoundClass.FINAL:
         is_permitted = not await _has_team_acted(team, action_type, tile)
@@ -59,7 +69,7 @@ async def is_permitted_to_act(
         ))
 
     elif action_type == ActionType.CHOICE:
-        is_permitted = team == await game.next_chooser
+        is_permitted = context.is_next_chooser
 
     elif action_type == ActionType.RESPONSE:
         if tile.is_daily_double:
@@ -90,17 +100,19 @@ def is_permitted_wager(team: TeamOrm, amount: int) -> bool:
 
 async def is_round_over(round_):
     """Determine if the current play involves the round's last tile."""
+    progress = await round_progress.load(round_)
+
     # Final round -- count the number of responses submitted
     if round_.class_ == RoundClass.FINAL:
         teams = len(await round_.game.teams)
-        if await _num_tiles(round_) * teams == await _num_responses(round_):
+        if progress["num_tiles"] * teams == progress["num_responses"]:
             is_over = True
         else:
             is_over = False
 
     # Basic round -- count the number of tiles chosen
     else:
-        if await _num_tiles(round_) == await _num_choices(round_):
+        if progress["num_tiles"] == progress["num_choices"]:
             is_over = True
         else:
             is_over = False
@@ -108,47 +120,25 @@ async def is_round_over(round_):
     return is_over
 
 
-async def _num_tiles(round_: RoundOrm) -> int:
-    """Helper for determining if round is over."""
-    return (
-        await TileOrm
-        .filter(category__board__round__id=round_.id)
-        .count()
-    )
-
-async def _num_choices(round_: RoundOrm) -> int:
-    """Helper for determining if round is over."""
-    return (
-        await ChoiceOrm
-        .filter(game__id=round_.game_id)
-        .filter(tile__category__board__round__id=round_.id)
-        .count()
-    )
-
-async def _num_responses(round_) -> int:
-    """Helper for determining if round is over."""
-    return (
-        await ResponseOrm
-        .filter(game__id=round_.game_id)
-        .filter(tile__category__board__round__id=round_.id)
-        .count()
-    )
-
-
 async def validate_game(game: Optional[GameOrm]) -> None:
     """Validate that the game is currently being played."""
     if game is None or not await is_active_game(game):
         raise exceptions.ForbiddenAccessException
 
 
-async def validate_user(game: GameOrm, user: UserOrm) -> None:
+async def validate_user(
+    game: GameOrm, user: UserOrm, context: Optional[ActionContext] = None
+) -> None:
     """Validate that the user is a player in the game."""
-    if not await is_player(game, user):
+    if not await is_player(game, user, context):
         raise exceptions.ForbiddenAccessException
 
 
 async def validate_request(
-    game: GameOrm, user: UserOrm, request: Request
+    game: GameOrm,
+    user: UserOrm,
+    request: Request,
+    context: Optional[ActionContext] = None,
 ) -> None:
     """Validate a player's incoming request to perform an action on a tile."""
     if request.message_id != game.next_message_id:
@@ -157,17 +147,19 @@ async def validate_request(
     if request.action.type_ != game.next_action_type:
         raise exceptions.ForbiddenActionException(game.next_action_type)
 
-    tile = await request.action.tile
+    if context is None:
+        context = await ActionContext.load(game, user, request.action.tile_id)
+    tile = context.tile
 
     if tile is None:
         raise exceptions.TileNotFoundException
 
-    if await tile.round_ != await game.next_round:
+    if not context.is_next_round:
         raise exceptions.TileNotFoundException
 
     action_type = request.action.type_
 
-    if not await is_permitted_to_act(game, user, action_type, tile):
+    if not await is_permitted_to_act(game, user, action_type, tile, context):
         raise exceptions.ActOutOfTurnException
 
     if action_type == ActionType.CHOICE:
@@ -175,6 +167,5 @@ async def validate_request(
             raise exceptions.TileAlreadyChosenException
 
     if action_type == ActionType.WAGER:
-        team = await user.team(game)
-        if not is_permitted_wager(team, request.action.amount):
+        if not is_permitted_wager(context.team, request.action.amount):
             raise exceptions.ForbiddenWagerException
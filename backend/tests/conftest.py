@@ -534,6 +534,7 @@ async def request_choice(database, game, tile):
 async def request_response(database, game, tile):
     next_message_id = 12
     game.next_message_id = next_message_id
+    await game.save()
     return Request(
         message_id=next_message_id,
         action=Response(
@@ -548,6 +549,7 @@ async def request_response(database, game, tile):
 async def request_wager(database, game, tile):
     next_message_id = 16
     game.next_message_id = next_message_id
+    await game.save()
     return Request(
         message_id=next_message_id,
         action=Wager(type="wager", tile_id=tile.id, amount=100),
@@ -0,0 +1,104 @@
+"""The state of a game laid out as state.full did before state.assemble.
+
+Tests check state.assemble against it, and the assemble benchmark measures
+both. The board is given as the rows boards reads from the database, and the
+reference builds the state from those rows through Game.from_orm and its
+validators, working out points on its own rather than taking them from the
+board's content.
+"""
+from types import SimpleNamespace
+from typing import Dict
+from typing import List
+
+from jeopardy import boards
+from jeopardy.models.game import GameStatus
+from jeopardy.models.game import RoundClass
+from jeopardy.schema.state import Game
+
+
+def board_rows(
+    class_: RoundClass = RoundClass.SINGLE,
+    num_categories: int = 6,
+    num_tiles_per_category: int = 5,
+) -> List[Dict]:
+    """Rows of a full board, as boards reads them in a single query.
+
+    The rows come in reverse order, so that whatever lays the board out has
+    to sort it.
+    """
+    return [
+        {
+            "class_": class_.value,
+            "status": GameStatus.STARTED.value,
+            "num_categories": num_categories,
+            "point_ladder": None,
+            "category_id": i + 1,
+            "category_name": f"Category {i}",
+            "category_ordinal": i,
+            "tile_id": 10 * (i + 1) + j,
+            "tile_ordinal": j,
+            "is_daily_double": False,
+            "answer": f"Answer {i}.{j}",
+            "question": f"Question {i}.{j}?",
+        }
+        for i in reversed(range(num_categories))
+        for j in reversed(range(num_tiles_per_category))
+    ]
+
+
+def board_content(rows: List[Dict], round_id: int = 1) -> boards.RoundContent:
+    """The board laid out by boards, as state.assemble takes it."""
+    content, _ = boards._content(round_id, rows)
+    return content
+
+
+def legacy_round(rows: List[Dict]) -> SimpleNamespace:
+    """The round as the ORM fetched it, with its board's relations."""
+    categories: Dict[int, SimpleNamespace] = {}
+    for row in rows:
+        category = categories.setdefault(row["category_id"], SimpleNamespace(
+            id=row["category_id"],
+            name=row["category_name"],
+            ordinal=row["category_ordinal"],
+            tiles=[],
+        ))
+        category.tiles.append(SimpleNamespace(
+            id=row["tile_id"],
+            ordinal=row["tile_ordinal"],
+            is_daily_double=row["is_daily_double"],
+            trivia=SimpleNamespace(
+                answer=row["answer"], question=row["question"]
+            ),
+        ))
+
+    board = SimpleNamespace(
+        num_categories=rows[0]["num_categories"],
+        categories=list(categories.values()),
+    )
+    return SimpleNamespace(class_=RoundClass(rows[0]["class_"]), board=[board])
+
+
+def legacy_full(game, teams, round_) -> Game:
+    """Lay out the state through Game.from_orm, as state.full once did."""
+    state = Game.from_orm(SimpleNamespace(
+        code=game.code,
+        next_message_id=game.next_message_id,
+        next_round=round_,
+        next_chooser=next(
+            (x for x in teams if x.id == game.next_chooser_id), None
+        ),
+        teams=teams,
+        status=game.status,
+    ))
+
+    # Set points for tiles in basic rounds
+    if state.round_.class_ != RoundClass.FINAL:
+        if state.round_.class_ == RoundClass.SINGLE:
+            multiplier = 200
+        else:
+            multiplier = 400
+        for category in state.round_.board.categories:
+            for position, tile in enumerate(category.tiles):
+                tile.points = multiplier * (position + 1)
+
+    return state
@@ -0,0 +1,239 @@
+import asyncio
+import uuid
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import jwt
+import pytest
+from fastapi.security import SecurityScopes
+
+from jeopardy import exceptions
+from jeopardy.auth import authorize
+from jeopardy.auth import cached_user
+from jeopardy.auth import current_user
+from jeopardy.auth import guest_user
+from jeopardy.auth import principal_from_user
+from jeopardy.auth import resolve
+from jeopardy.auth import revoke_token
+from jeopardy.auth import user_from_google_metadata
+from jeopardy.auth import verified_claims
+from jeopardy.models.user import AuthProvider
+from jeopardy.models.user import GoogleUserMetadataOrm
+from jeopardy.models.user import Nobody
+from jeopardy.schema.user import GoogleUserMetadata
+from jeopardy.schema.user import Principal
+
+
+pytestmark = pytest.mark.asyncio
+
+
+class TestPrincipalFromUser:
+    async def test_nobody_is_inactive(self):
+        expected = Principal()
+        actual = principal_from_user(Nobody)
+        assert expected == actual
+
+    async def test_anonymous_user_can_only_play(self, anonymous_user):
+        expected = Principal(
+            id=anonymous_user.id,
+            is_active=True,
+            name=anonymous_user.username,
+            scopes=["play"],
+        )
+        actual = principal_from_user(anonymous_user)
+        assert expected == actual
+
+    async def test_google_user_can_create(self):
+        user = SimpleNamespace(
+            id=1, is_active=True, username="Test", google_metadata_id=2
+        )
+        actual = principal_from_user(user)
+        assert ["play", "create"] == actual.scopes
+
+
+class TestResolve:
+    @patch("jeopardy.auth.UserOrm.get_or_none")
+    @patch("jeopardy.auth.keys")
+    async def test_trusts_claims_without_looking_up_user(
+        self, mock_keys, mock_get_or_none
+    ):
+        mock_keys.decode.return_value = {
+            "sub": 1, "name": "Test", "scopes": ["play"]
+        }
+        expected = Principal(
+            id=1, is_active=True, name="Test", scopes=["play"]
+        )
+        # patch.dict as a decorator isn't in effect while a coroutine runs
+        # before Python 3.10
+        with patch.dict("os.environ", {"TRUST_TOKEN_CLAIMS": "true"}):
+            actual, user = await resolve("token")
+        assert expected == actual
+        assert user is None
+        mock_get_or_none.assert_not_called()
+
+    @patch("jeopardy.auth.UserOrm.get_or_none")
+    @patch("jeopardy.auth.keys")
+    async def test_resolves_guest_without_looking_up_user(
+        self, mock_keys, mock_get_or_none
+    ):
+        mock_keys.decode.return_value = {
+            "guest": "abc", "name": "Guest 1234", "scopes": ["play"]
+        }
+        expected = Principal(
+            is_active=True, guest_id="abc", name="Guest 1234", scopes=["play"]
+        )
+        actual, user = await resolve("token")
+        assert expected == actual
+        assert user is None
+        mock_get_or_none.assert_not_called()
+
+    @patch("jeopardy.auth.keys")
+    async def test_invalid_token_is_nobody(self, mock_keys):
+        mock_keys.decode.side_effect = ValueError
+        principal, user = await resolve("token")
+        assert Principal() == principal
+        assert Nobody is user
+
+
+class TestGuestUser:
+    async def test_creates_guest_user_once(self, database):
+        guest_id = uuid.uuid4().hex
+        user = await guest_user(guest_id, "Guest 1234")
+        assert "Guest 1234" == user.username
+        assert AuthProvider.NONE == user.auth_provider
+
+        same_user = await guest_user(guest_id, "Guest 1234")
+        assert user.id == same_user.id
+
+    async def test_concurrent_connections_share_guest_user(self, database):
+        guest_id = uuid.uuid4().hex
+        users = await asyncio.gather(
+            *(guest_user(guest_id, "Guest 1234") for _ in range(3))
+        )
+        assert 1 == len({x.id for x in users})
+
+
+class TestUserFromGoogleMetadata:
+    async def test_creates_user_then_updates_metadata(self, database):
+        subject = uuid.uuid4().hex
+        metadata = GoogleUserMetadata(
+            sub=subject, iss="accounts.google.com", email="a@example.com"
+        )
+        user = await user_from_google_metadata(metadata)
+        assert "a@example.com" == user.username
+        assert AuthProvider.GOOGLE == user.auth_provider
+
+        metadata.email = "b@example.com"
+        same_user = await user_from_google_metadata(metadata)
+        assert user.id == same_user.id
+
+        stored = await GoogleUserMetadataOrm.get(subject=subject)
+        assert "b@example.com" == stored.email
+
+    async def test_concurrent_logins_share_user(self, database):
+        subject = uuid.uuid4().hex
+        metadata = GoogleUserMetadata(
+            sub=subject, iss="accounts.google.com", email="a@example.com"
+        )
+        users = await asyncio.gather(
+            *(user_from_google_metadata(metadata) for _ in range(5))
+        )
+        assert 1 == len({x.id for x in users})
+        assert 1 == await GoogleUserMetadataOrm.filter(subject=subject).count()
+
+
+class TestVerifiedClaims:
+    @patch("jeopardy.auth.revocations")
+    @patch("jeopardy.auth.keys")
+    async def test_rejects_revoked_token(self, mock_keys, mock_revocations):
+        mock_keys.decode.return_value = {"sub": 1, "jti": "abc"}
+        mock_revocations.is_revoked.return_value = True
+        with pytest.raises(jwt.InvalidTokenError):
+            verified_claims("token")
+        mock_revocations.is_revoked.assert_called_with("abc")
+
+
+class TestRevokeToken:
+    @patch("jeopardy.auth.revocations", autospec=True)
+    @patch("jeopardy.auth.guest_user")
+    @patch("jeopardy.auth.keys")
+    async def test_revokes_guest_token_without_creating_user(
+        self, mock_keys, mock_guest_user, mock_revocations
+    ):
+        mock_keys.decode.return_value = {
+            "guest": "abc", "name": "Guest 1234", "jti": "def", "exp": 0
+        }
+        mock_revocations.is_revoked.return_value = False
+
+        await revoke_token("token")
+
+        mock_guest_user.assert_not_called()
+        args, _ = mock_revocations.revoke.call_args
+        assert ("def", None) == args[:2]
+
+
+class TestCachedUser:
+    async def test_reuses_cached_user(self, anonymous_user):
+        user = await cached_user(anonymous_user.id)
+        with patch("jeopardy.auth.UserOrm.get_or_none") as mock_get_or_none:
+            assert user is await cached_user(anonymous_user.id)
+            mock_get_or_none.assert_not_called()
+
+    async def test_forgets_user_when_saved(self, anonymous_user):
+        await cached_user(anonymous_user.id)
+        anonymous_user.is_active = False
+        await anonymous_user.save()
+
+        user = await cached_user(anonymous_user.id)
+        assert not user.is_active
+
+
+class TestCurrentUser:
+    async def test_loads_user_of_trusted_principal(self, anonymous_user):
+        principal = principal_from_user(anonymous_user)
+        request = FakeConnection({"principal": principal})
+
+        user = await current_user(request)
+        assert anonymous_user.id == user.id
+        assert user is request.scope["user"]
+
+    async def test_creates_user_of_guest_principal(self, database):
+        principal = Principal(
+            is_active=True,
+            guest_id=uuid.uuid4().hex,
+            name="Guest 1234",
+            scopes=["play"],
+        )
+        request = FakeConnection({"principal": principal})
+
+        user = await current_user(request)
+        assert "Guest 1234" == user.username
+        assert user is request.scope["user"]
+
+    async def test_inactive_principal_is_nobody(self):
+        request = FakeConnection({"principal": Principal()})
+        assert Nobody is await current_user(request)
+
+
+class FakeConnection:
+    def __init__(self, scope):
+        self.scope = scope
+
+
+class TestAuthorize:
+    async def test_errors_if_principal_is_inactive(self):
+        security = SecurityScopes(scopes=["create"])
+        with pytest.raises(exceptions.InvalidTokenException):
+            await authorize(security, Principal())
+
+    async def test_errors_if_principal_lacks_scope(self):
+        security = SecurityScopes(scopes=["create"])
+        principal = Principal(id=1, is_active=True, scopes=["play"])
+        with pytest.raises(exceptions.InsufficientScopeException):
+            await authorize(security, principal)
+
+    async def test_permits_principal_with_scope(self):
+        security = SecurityScopes(scopes=["create"])
+        principal = Principal(id=1, is_active=True, scopes=["play", "create"])
+        actual = await authorize(security, principal)
+        assert principal == actual
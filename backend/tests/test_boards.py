@@ -0,0 +1,104 @@
+from unittest.mock import patch
+
+import pytest
+
+from jeopardy import boards
+from jeopardy.models.game import BoardOrm
+from jeopardy.models.game import GameStatus
+from jeopardy.models.game import RoundClass
+
+
+pytestmark = pytest.mark.asyncio
+
+
+class TestLoad:
+    async def test_reads_board_in_order(self, round_, tile_1, tile_2):
+        content = await boards.load(round_.id)
+
+        assert RoundClass.SINGLE == content.class_
+        assert 2 == content.num_categories
+        actual = [tile.id for tile in content.categories[0].tiles]
+        expected = [tile_1.id, tile_2.id]
+        assert expected == actual
+        assert "Test question 2?" == content.tile(tile_2.id).question
+
+    async def test_keeps_board_of_started_game(self, round_, tile):
+        expected = await boards.load(round_.id)
+
+        with patch("jeopardy.boards.RoundOrm.filter") as mock_filter:
+            actual = await boards.load(round_.id)
+            mock_filter.assert_not_called()
+        assert expected == actual
+
+    async def test_rereads_board_of_editable_game(self, game, round_, tile):
+        game.status = GameStatus.EDITABLE
+        await game.save()
+        await boards.load(round_.id)
+
+        with patch(
+            "jeopardy.boards.RoundOrm.filter", wraps=boards.RoundOrm.filter
+        ) as mock_filter:
+            await boards.load(round_.id)
+            mock_filter.assert_called()
+
+    async def test_missing_round_loads_as_none(self, round_):
+        assert await boards.load(round_.id + 1000) is None
+
+
+class TestBuild:
+    async def test_keeps_boards_of_all_rounds(
+        self, game, round_1, round_2, tile, round_2_tile
+    ):
+        await boards.build(game)
+
+        with patch("jeopardy.boards.RoundOrm.filter") as mock_filter:
+            content = await boards.load(round_2.id)
+            mock_filter.assert_not_called()
+        assert content.tile(round_2_tile.id) is not None
+
+
+class TestRoundContent:
+    async def test_finds_tile_position(self, round_, tile_1, tile_2):
+        content = await boards.load(round_.id)
+
+        assert 0 == content.position(tile_1.id)
+        assert 1 == content.position(tile_2.id)
+        assert content.position(tile_2.id + 1000) is None
+        assert 2 == content.num_tiles
+
+    async def test_places_tiles_on_standard_ladder(
+        self, round_, tile_1, tile_2
+    ):
+        content = await boards.load(round_.id)
+
+        place = content.place(tile_2.id)
+        assert RoundClass.SINGLE == place.class_
+        assert tile_2.category_id == place.category_id
+        assert 1 == place.position
+        assert 400 == place.points
+
+    async def test_places_tiles_on_custom_ladder(
+        self, round_, tile_1, tile_2
+    ):
+        await (
+            BoardOrm
+            .filter(round__id=round_.id)
+            .update(point_ladder="[100, 300]")
+        )
+        content = await boards.load(round_.id)
+
+        assert 100 == content.place(tile_1.id).points
+        assert 300 == content.place(tile_2.id).points
+
+
+class TestTilePoints:
+    def test_standard_ladders(self):
+        assert 600 == boards.tile_points(RoundClass.SINGLE, 2)
+        assert 1200 == boards.tile_points(RoundClass.DOUBLE, 2)
+
+    def test_final_round_tiles_have_no_points(self):
+        assert boards.tile_points(RoundClass.FINAL, 0, [100]) is None
+
+    def test_custom_ladder_falls_back_to_standard_ladder(self):
+        assert 50 == boards.tile_points(RoundClass.SINGLE, 0, [50])
+        assert 400 == boards.tile_points(RoundClass.SINGLE, 1, [50])
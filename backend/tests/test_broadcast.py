@@ -0,0 +1,178 @@
+import asyncio
+import json
+
+import pytest
+
+from jeopardy.broadcast import Hub
+from jeopardy.frames import View
+from jeopardy.schema.state import Audience
+
+
+pytestmark = pytest.mark.asyncio
+
+
+class FakeWebSocket:
+    def __init__(self, is_closed=False):
+        self.is_closed = is_closed
+        self.sent = []
+
+    async def send_text(self, data):
+        if self.is_closed:
+            raise RuntimeError("Cannot send on a closed websocket")
+        self.sent.append(json.loads(data))
+
+
+def _views(game_state):
+    return {audience: View(game_state) for audience in Audience}
+
+
+@pytest.fixture
+def game_state():
+    return {"code": 1, "message_id": 1, "display": {"level": "game"}}
+
+
+class TestPublish:
+    async def test_all_subscribers_receive_state(self, game_state):
+        hub = Hub()
+        websockets = [FakeWebSocket(), FakeWebSocket()]
+        for websocket in websockets:
+            hub.subscribe(1, websocket)
+
+        await hub.publish(1, _views(game_state))
+
+        for websocket in websockets:
+            assert len(websocket.sent) == 1
+            assert websocket.sent[0]["type"] == "snapshot"
+            assert websocket.sent[0]["state"]["message_id"] == 1
+
+    async def test_consecutive_states_sent_as_patch(self, game_state):
+        hub = Hub()
+        websocket = FakeWebSocket()
+        hub.subscribe(1, websocket)
+
+        await hub.publish(1, _views(game_state))
+        await hub.publish(1, _views({**game_state, "message_id": 2}))
+
+        actual = websocket.sent[-1]
+        expected = {
+            "type": "patch",
+            "from": 1,
+            "message_id": 2,
+            "operations": [
+                {"op": "replace", "path": "/message_id", "value": 2},
+            ],
+        }
+        assert expected == actual
+
+    async def test_snapshot_sent_after_gap(self, game_state):
+        hub = Hub()
+        websocket = FakeWebSocket()
+        hub.subscribe(1, websocket)
+
+        await hub.publish(1, _views(game_state))
+        await hub.publish(1, _views({**game_state, "message_id": 3}))
+
+        assert websocket.sent[-1]["type"] == "snapshot"
+
+    async def test_subscribers_of_other_games_receive_nothing(
+        self, game_state
+    ):
+        hub = Hub()
+        websocket = FakeWebSocket()
+        hub.subscribe(2, websocket)
+
+        await hub.publish(1, _views(game_state))
+
+        assert websocket.sent == []
+
+    async def test_closed_subscribers_are_dropped(self, game_state):
+        hub = Hub()
+        closed_websocket = FakeWebSocket(is_closed=True)
+        hub.subscribe(1, closed_websocket)
+
+        await hub.publish(1, _views(game_state))
+        closed_websocket.is_closed = False
+        await hub.publish(1, _views({**game_state, "message_id": 2}))
+
+        assert closed_websocket.sent == []
+
+    async def test_older_messages_published_late_are_dropped(
+        self, game_state
+    ):
+        hub = Hub()
+        websocket = FakeWebSocket()
+        hub.subscribe(1, websocket)
+
+        await hub.publish(1, _views({**game_state, "message_id": 3}))
+        await hub.publish(1, _views({**game_state, "message_id": 2}))
+
+        assert 1 == len(websocket.sent)
+        views = await hub.wait(1, after=2, timeout=0.01)
+        assert 3 == views[Audience.SPECTATOR].message_id
+
+    async def test_subscribers_receive_view_of_their_audience(
+        self, game_state
+    ):
+        hub = Hub()
+        host = FakeWebSocket()
+        player = FakeWebSocket()
+        hub.subscribe(1, host, Audience.HOST)
+        hub.subscribe(1, player, Audience.PLAYER)
+
+        views = _views(game_state)
+        views[Audience.HOST] = View({**game_state, "answer": "Test answer"})
+        await hub.publish(1, views)
+
+        assert "Test answer" == host.sent[0]["state"]["answer"]
+        assert "answer" not in player.sent[0]["state"]
+
+
+class TestWait:
+    async def test_waiters_receive_next_message(self, game_state):
+        hub = Hub()
+        waiting = [
+            asyncio.ensure_future(hub.wait(1, after=1, timeout=5))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+
+        await hub.publish(1, _views({**game_state, "message_id": 2}))
+
+        for views in await asyncio.gather(*waiting):
+            assert 2 == views[Audience.SPECTATOR].message_id
+
+    async def test_message_published_before_waiting_returned(
+        self, game_state
+    ):
+        hub = Hub()
+        await hub.publish(1, _views({**game_state, "message_id": 2}))
+
+        views = await hub.wait(1, after=1, timeout=5)
+
+        assert 2 == views[Audience.SPECTATOR].message_id
+
+    async def test_older_messages_keep_waiting(self, game_state):
+        hub = Hub()
+        waiting = asyncio.ensure_future(hub.wait(1, after=2, timeout=5))
+        await asyncio.sleep(0)
+
+        await hub.publish(1, _views({**game_state, "message_id": 2}))
+        await asyncio.sleep(0)
+        assert not waiting.done()
+
+        await hub.publish(1, _views({**game_state, "message_id": 3}))
+        assert 3 == (await waiting)[Audience.SPECTATOR].message_id
+
+    async def test_timeout_returns_none_and_forgets_waiter(self):
+        hub = Hub()
+
+        assert await hub.wait(1, after=1, timeout=0.01) is None
+        assert 1 not in hub._waiters
+
+    async def test_messages_of_other_games_not_returned(self, game_state):
+        # A new game can take over a finished game's code, so games are told
+        # apart by id
+        hub = Hub()
+        await hub.publish(1, _views({**game_state, "message_id": 5}))
+
+        assert await hub.wait(2, after=1, timeout=0.01) is None
@@ -0,0 +1,72 @@
+from jeopardy.cache import LRUCache
+from jeopardy.cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTTLCache:
+    def test_gets_value_that_was_set(self):
+        cache = TTLCache()
+        cache.set("a", 1)
+        assert 1 == cache.get("a")
+        assert "a" in cache
+
+    def test_expires_value_after_ttl(self):
+        clock = FakeClock()
+        cache = TTLCache(ttl=10, clock=clock)
+        cache.set("a", 1)
+
+        clock.now = 9
+        assert 1 == cache.get("a")
+
+        clock.now = 10
+        assert cache.get("a") is None
+        assert 0 == len(cache)
+
+    def test_evicts_least_recently_used_when_full(self):
+        cache = TTLCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert "a" in cache
+        assert "b" not in cache
+        assert "c" in cache
+
+    def test_pops_value(self):
+        cache = TTLCache()
+        cache.set("a", 1)
+        assert 1 == cache.pop("a")
+        assert cache.pop("a") is None
+
+
+class TestLRUCache:
+    def test_gets_value_that_was_set(self):
+        cache = LRUCache()
+        cache.set("a", 1)
+        assert 1 == cache.get("a")
+        assert "a" in cache
+
+    def test_evicts_least_recently_used_when_full(self):
+        cache = LRUCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert "a" in cache
+        assert "b" not in cache
+        assert "c" in cache
+
+    def test_pop_removes_value(self):
+        cache = LRUCache()
+        cache.set("a", 1)
+        assert 1 == cache.pop("a")
+        assert "a" not in cache
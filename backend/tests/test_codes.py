@@ -0,0 +1,133 @@
+from unittest.mock import patch
+
+import pytest
+
+from jeopardy import codes
+from jeopardy import exceptions
+from jeopardy.codes import CodePool
+from jeopardy.models.game import GameOrm
+from jeopardy.models.game import GameStatus
+
+
+pytestmark = pytest.mark.asyncio
+
+
+class TestCodePool:
+    async def test_allocates_distinct_codes_from_one_refill(self, database):
+        pool = CodePool(batch_size=8)
+        with patch.object(pool, "refill", wraps=pool.refill) as mock_refill:
+            allocated = [await pool.allocate() for _ in range(4)]
+        assert 4 == len(set(allocated))
+        assert 1 == mock_refill.call_count
+
+    async def test_skips_codes_in_use(self, game):
+        pool = CodePool(batch_size=1)
+        pool._start = _index_of(game.code)
+        pool._stride = 1
+        assert game.code != await pool.allocate()
+
+    async def test_finds_last_free_code(self):
+        pool = CodePool()
+
+        async def in_use(candidates):
+            return set(candidates) - {"QZQZ"}
+
+        with patch.object(pool, "_recycle", return_value=[]):
+            with patch.object(pool, "_in_use", in_use):
+                assert "QZQZ" == await pool.allocate()
+
+    async def test_errors_when_every_code_is_in_use(self):
+        pool = CodePool()
+
+        async def in_use(candidates):
+            return set(candidates)
+
+        with patch.object(pool, "_recycle", return_value=[]):
+            with patch.object(pool, "_in_use", in_use):
+                with pytest.raises(exceptions.GameCodesExhaustedException):
+                    await pool.allocate()
+
+    async def test_recycles_codes_of_finished_games(self, game):
+        game.status = GameStatus.FINISHED
+        await game.save()
+        code = game.code
+
+        pool = CodePool(finished_seconds=-60)
+        await pool.refill()
+        assert code in pool._codes
+
+        recycled_game = await GameOrm.get(id=game.id)
+        assert recycled_game.code is None
+
+    async def test_keeps_codes_of_recently_finished_games(self, game):
+        game.status = GameStatus.FINISHED
+        await game.save()
+
+        pool = CodePool()
+        assert game.code not in await pool._recycle()
+        assert (await GameOrm.get(id=game.id)).code == game.code
+
+    async def test_recycles_codes_of_idle_joinable_games(self, game):
+        game.status = GameStatus.JOINABLE
+        await game.save()
+
+        pool = CodePool(idle_seconds=-60)
+        assert game.code in await pool._recycle()
+
+    @pytest.mark.parametrize(
+        "status", [GameStatus.EDITABLE, GameStatus.STARTED]
+    )
+    async def test_keeps_codes_of_idle_games_being_edited_or_played(
+        self, game, status
+    ):
+        game.status = status
+        await game.save()
+
+        pool = CodePool(idle_seconds=-60)
+        assert game.code not in await pool._recycle()
+        assert (await GameOrm.get(id=game.id)).code == game.code
+
+
+def _index_of(code):
+    index = 0
+    for letter in code:
+        index = index * len(codes.ALPHABET) + codes.ALPHABET.index(letter)
+    return index
+
+
+class TestCodeAt:
+    async def test_spells_out_index(self):
+        assert "AAAA" == codes.code_at(0)
+        assert "AABA" == codes.code_at(26)
+        assert "ZZZZ" == codes.code_at(codes.NUM_CODES - 1)
+
+    async def test_round_trips_codes(self):
+        assert "QZQZ" == codes.code_at(_index_of("QZQZ"))
+
+
+class TestResolve:
+    async def test_resolves_game_once(self, game):
+        codes.forget(game.code)
+        expected = (game.id, game.status, game.owner_id)
+        assert expected == await codes.resolve(game.code)
+
+        with patch("jeopardy.codes.GameOrm.filter") as mock_filter:
+            assert expected == await codes.resolve(game.code)
+            mock_filter.assert_not_called()
+
+    async def test_remembers_unknown_codes(self, database):
+        code = "0000"
+        codes.forget(code)
+        assert await codes.resolve(code) is None
+
+        with patch("jeopardy.codes.GameOrm.filter") as mock_filter:
+            assert await codes.resolve(code) is None
+            mock_filter.assert_not_called()
+
+    async def test_remember_updates_status(self, game):
+        await codes.resolve(game.code)
+        game.status = GameStatus.FINISHED
+        codes.remember(game)
+
+        expected = (game.id, GameStatus.FINISHED, game.owner_id)
+        assert expected == await codes.resolve(game.code)
@@ -0,0 +1,56 @@
+import pytest
+
+from jeopardy.context import ActionContext
+
+
+pytestmark = pytest.mark.asyncio
+
+
+class TestLoad:
+    async def test_rows_for_action_loaded(
+        self, game_started_with_team_1, team_1, player_1, round_, tile
+    ):
+        game = game_started_with_team_1
+        context = await ActionContext.load(game, player_1, tile.id)
+
+        assert context.team == team_1
+        assert context.tile == tile
+        assert context.round_ == round_
+
+    async def test_missing_tile_loads_as_none(
+        self, game_started_with_team_1, player_1, tile
+    ):
+        game = game_started_with_team_1
+        context = await ActionContext.load(game, player_1, tile.id + 1)
+
+        assert context.tile is None
+        assert context.round_ is None
+
+
+class TestIsNextRound:
+    async def test_tile_in_next_round(
+        self, game_started_with_team_1, player_1, tile
+    ):
+        game = game_started_with_team_1
+        context = await ActionContext.load(game, player_1, tile.id)
+        assert context.is_next_round
+
+    async def test_tile_in_other_round(
+        self, game_started_with_team_1, player_1, round_2_tile
+    ):
+        game = game_started_with_team_1
+        context = await ActionContext.load(game, player_1, round_2_tile.id)
+        assert not context.is_next_round
+
+
+class TestIsNextChooser:
+    async def test_team_chooses_next(
+        self, game_started_with_team_1, player_1, player_2, tile
+    ):
+        game = game_started_with_team_1
+
+        context = await ActionContext.load(game, player_1, tile.id)
+        assert context.is_next_chooser
+
+        context = await ActionContext.load(game, player_2, tile.id)
+        assert not context.is_next_chooser
@@ -0,0 +1,48 @@
+from unittest.mock import patch
+
+import pytest
+
+from jeopardy import create
+from jeopardy.models.game import GameOrm
+from jeopardy.models.game import TileOrm
+
+
+pytestmark = pytest.mark.asyncio
+
+
+class TestGame:
+    async def test_creates_board_with_distinct_trivia(self, google_user):
+        game_state = await create.game(
+            google_user,
+            name="Test Create Board",
+            max_teams=3,
+            max_players_per_team=3,
+        )
+
+        tiles = await (
+            TileOrm
+            .filter(category__board__round__game__code=game_state.code)
+            .values("ordinal", "trivia_id", "trivia__answer")
+        )
+        assert 30 == len(tiles)
+        assert 30 == len({x["trivia_id"] for x in tiles})
+        assert {"Answer"} == {x["trivia__answer"] for x in tiles}
+        assert {0, 1, 2, 3, 4} == {x["ordinal"] for x in tiles}
+
+        categories = game_state.round_.board.categories
+        assert [f"Category {i}" for i in range(6)] == [
+            x.name for x in categories
+        ]
+
+    async def test_creates_nothing_when_board_fails(self, google_user):
+        name = "Test Create Rollback"
+        with patch.object(TileOrm, "bulk_create", side_effect=RuntimeError):
+            with pytest.raises(RuntimeError):
+                await create.game(
+                    google_user,
+                    name=name,
+                    max_teams=3,
+                    max_players_per_team=3,
+                )
+
+        assert not await GameOrm.exists(name=name)
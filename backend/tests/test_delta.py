@@ -0,0 +1,61 @@
+import pytest
+
+from jeopardy.delta import apply
+from jeopardy.delta import diff
+
+
+@pytest.fixture
+def old_state():
+    return {
+        "message_id": 4,
+        "team_that_chooses": "Team Elf",
+        "teams": [
+            {"id": 1, "name": "Team Elf", "players": [{"id": 1}]},
+            {"id": 2, "name": "Team Ogre", "players": [{"id": 2}]},
+        ],
+    }
+
+
+class TestDiff:
+    def test_no_operations_for_equal_states(self, old_state):
+        assert diff(old_state, old_state) == []
+
+    def test_changed_value_is_replaced(self, old_state):
+        new_state = {**old_state, "team_that_chooses": "Team Ogre"}
+        actual = diff(old_state, new_state)
+        expected = [{
+            "op": "replace", "path": "/team_that_chooses", "value": "Team Ogre"
+        }]
+        assert expected == actual
+
+    def test_appended_list_item_is_added(self, old_state):
+        new_state = apply(old_state, [])
+        new_state["teams"][0]["players"].append({"id": 3})
+        actual = diff(old_state, new_state)
+        expected = [
+            {"op": "add", "path": "/teams/0/players/1", "value": {"id": 3}}
+        ]
+        assert expected == actual
+
+    def test_keys_are_escaped(self):
+        actual = diff({"a/b~c": 1}, {"a/b~c": 2})
+        expected = [{"op": "replace", "path": "/a~1b~0c", "value": 2}]
+        assert expected == actual
+
+
+class TestApply:
+    def test_round_trip(self, old_state):
+        new_state = apply(old_state, [])
+        new_state["message_id"] = 5
+        new_state["teams"].pop()
+        new_state["teams"][0]["players"].append({"id": 2})
+        del new_state["team_that_chooses"]
+
+        actual = apply(old_state, diff(old_state, new_state))
+        expected = new_state
+        assert expected == actual
+
+    def test_original_document_unchanged(self, old_state):
+        new_state = {**old_state, "message_id": 5}
+        apply(old_state, diff(old_state, new_state))
+        assert old_state["message_id"] == 4
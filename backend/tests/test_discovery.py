@@ -0,0 +1,109 @@
+import json
+import shutil
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from jeopardy.discovery import DiscoveryCache
+
+
+pytestmark = pytest.mark.asyncio
+
+
+FIXTURE = Path(__file__).parent / "fixtures" / "google_discovery.json"
+URL = "https://accounts.google.com/.well-known/openid-configuration"
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self._data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._data
+
+
+class FakeHttp:
+    """Serves the fixture in place of the provider."""
+    def __init__(self, *args, **kwargs):
+        self.document = json.loads(FIXTURE.read_text())
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        pass
+
+    async def get(self, url):
+        if url == URL:
+            return FakeResponse(self.document["metadata"])
+        return FakeResponse(self.document["jwks"])
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    path = tmp_path / "discovery.json"
+    shutil.copy(FIXTURE, path)
+    return path
+
+
+def _client():
+    return SimpleNamespace(server_metadata={})
+
+
+def _touch(path, loaded_at):
+    document = json.loads(path.read_text())
+    document["loaded_at"] = loaded_at
+    path.write_text(json.dumps(document))
+
+
+class TestDiscoveryCache:
+    async def test_loads_fresh_copy_without_fetching(self, cache_path):
+        _touch(cache_path, time.time())
+        client = _client()
+        cache = DiscoveryCache(client, URL, path=str(cache_path))
+
+        with patch.object(cache, "refresh") as mock_refresh:
+            await cache.load()
+            mock_refresh.assert_not_called()
+
+        assert "jwks_uri" in client.server_metadata
+        assert "keys" in client.server_metadata["jwks"]
+        assert "_loaded_at" in client.server_metadata
+
+    async def test_refetches_and_saves_stale_copy(self, cache_path):
+        client = _client()
+        cache = DiscoveryCache(client, URL, path=str(cache_path))
+
+        with patch("jeopardy.discovery.httpx.AsyncClient", FakeHttp):
+            await cache.load()
+
+        assert cache.is_fresh
+        saved = json.loads(cache_path.read_text())
+        assert saved["loaded_at"] > 0
+        assert "keys" in client.server_metadata["jwks"]
+
+    async def test_uses_stale_copy_when_offline(self, cache_path):
+        client = _client()
+        cache = DiscoveryCache(client, URL, path=str(cache_path))
+
+        with patch.object(cache, "refresh", side_effect=OSError):
+            await cache.load()
+
+        assert not cache.is_fresh
+        assert "jwks_uri" in client.server_metadata
+
+    async def test_leaves_client_alone_without_any_copy(self, tmp_path):
+        client = _client()
+        path = tmp_path / "missing.json"
+        cache = DiscoveryCache(client, URL, path=str(path))
+
+        with patch.object(cache, "refresh", side_effect=OSError):
+            await cache.load()
+
+        assert {} == client.server_metadata
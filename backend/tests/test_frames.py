@@ -0,0 +1,54 @@
+import json
+
+from jeopardy import frames
+from jeopardy.frames import View
+from jeopardy.schema.state import Audience
+
+
+class TestEncode:
+    def test_encodes_compact_utf8_json(self):
+        actual = frames.encode({"name": "Café", "ids": [1, 2]})
+        assert isinstance(actual, bytes)
+        assert {"name": "Café", "ids": [1, 2]} == json.loads(actual)
+        assert b" " not in actual
+
+
+class TestView:
+    def test_body_encoded_once(self):
+        view = View({"message_id": 1})
+        assert view.body is view.body
+        assert {"message_id": 1} == json.loads(view.body)
+
+
+class TestSnapshot:
+    def test_wraps_view_in_snapshot_message(self):
+        view = View({"message_id": 3, "code": "ABCD"})
+
+        actual = json.loads(frames.snapshot(view))
+
+        expected = {
+            "type": "snapshot",
+            "message_id": 3,
+            "state": {"message_id": 3, "code": "ABCD"},
+        }
+        assert expected == actual
+
+
+class TestEtag:
+    def test_tags_game_message_and_audience(self):
+        assert '"12-3-spectator"' == frames.etag(12, 3, Audience.SPECTATOR)
+        assert '"12-0-spectator"' == frames.etag(12, None, Audience.SPECTATOR)
+
+    def test_matches_current_tag(self):
+        etag = frames.etag(12, 3, Audience.SPECTATOR)
+
+        assert frames.etag_matches(etag, etag)
+        assert frames.etag_matches(f'"a", W/{etag}', etag)
+        assert frames.etag_matches("*", etag)
+
+    def test_does_not_match_older_tag(self):
+        etag = frames.etag(12, 3, Audience.SPECTATOR)
+        older_etag = frames.etag(12, 2, Audience.SPECTATOR)
+
+        assert not frames.etag_matches(older_etag, etag)
+        assert not frames.etag_matches(None, etag)
@@ -0,0 +1,80 @@
+import jwt
+import pytest
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from jeopardy.keys import KeyManager
+
+
+def _key_pair():
+    private_key = rsa.generate_private_key(
+        public_exponent=65537, key_size=2048, backend=default_backend()
+    )
+    private_pem = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.TraditionalOpenSSL,
+        encryption_algorithm=serialization.NoEncryption(),
+    )
+    public_pem = private_key.public_key().public_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo,
+    )
+    return private_pem.decode("utf-8"), public_pem.decode("utf-8")
+
+
+@pytest.fixture(scope="module")
+def old_key_pair():
+    return _key_pair()
+
+
+@pytest.fixture(scope="module")
+def new_key_pair():
+    return _key_pair()
+
+
+class TestKeyManager:
+    def test_decodes_token_it_encoded(self, new_key_pair):
+        keys = KeyManager()
+        keys.load(*new_key_pair, key_id="new")
+
+        token = keys.encode({"sub": 1})
+        assert "new" == jwt.get_unverified_header(token)["kid"]
+        assert {"sub": 1} == keys.decode(token)
+
+    def test_decodes_token_signed_with_retired_key(
+        self, old_key_pair, new_key_pair
+    ):
+        old_keys = KeyManager()
+        old_keys.load(*old_key_pair, key_id="old")
+        token = old_keys.encode({"sub": 1})
+
+        keys = KeyManager()
+        keys.load(
+            *new_key_pair,
+            key_id="new",
+            retired_public_keys={"old": old_key_pair[1]},
+        )
+        assert {"sub": 1} == keys.decode(token)
+
+    def test_decodes_token_without_key_id_with_current_key(
+        self, new_key_pair
+    ):
+        keys = KeyManager()
+        keys.load(*new_key_pair)
+        private_pem, _ = new_key_pair
+        token = jwt.encode({"sub": 1}, private_pem, algorithm="RS256")
+
+        assert {"sub": 1} == keys.decode(token.decode("utf-8"))
+
+    def test_rejects_token_with_unknown_key_id(
+        self, old_key_pair, new_key_pair
+    ):
+        old_keys = KeyManager()
+        old_keys.load(*old_key_pair, key_id="old")
+        token = old_keys.encode({"sub": 1})
+
+        keys = KeyManager()
+        keys.load(*new_key_pair, key_id="new")
+        with pytest.raises(jwt.InvalidTokenError):
+            keys.decode(token)
@@ -1,3 +1,4 @@
+import asyncio
 from unittest.mock import patch
 
 import pytest
@@ -111,6 +112,25 @@ class TestAssign:
         assert len(team_1.players) == 0
 
 
+    async def test_concurrent_joins_all_placed(
+        self, game, team_1, team_2, player_1, player_2, some_user
+    ):
+        games = [await GameOrm.get(id=game.id) for _ in range(2)]
+        users = [player_1, some_user]
+
+        await asyncio.gather(
+            *(assign(x, y, team_2.name) for x, y in zip(games, users))
+        )
+
+        updated_game = await GameOrm.get(id=game.id)
+        expected = (game.next_message_id or 0) + 2
+        actual = updated_game.next_message_id
+        assert expected == actual
+
+        await team_2.fetch_related("players")
+        assert {player_1.id, some_user.id} <= {x.id for x in team_2.players}
+
+
 class TestNextRoundActionType:
     async def test_choice_at_basic_round_start(self, no_action):
         prev_action = no_action
@@ -247,6 +267,40 @@ class TestPerform:
 
         assert expected == actual
 
+    async def test_errors_when_message_id_already_claimed(
+        self, game_started_with_team_1, player_1, request_choice
+    ):
+        game = game_started_with_team_1
+        stale_game = await GameOrm.get(id=game.id)
+        action = request_choice.action
+        await perform(game, player_1, action)
+
+        with pytest.raises(exceptions.InvalidRequestException):
+            await perform(stale_game, player_1, action)
+
+    async def test_only_one_of_concurrent_requests_performed(
+        self, game_started_with_team_1, player_1, request_choice
+    ):
+        game = game_started_with_team_1
+        games = [await GameOrm.get(id=game.id) for _ in range(2)]
+        action = request_choice.action
+
+        results = await asyncio.gather(
+            *(perform(x, player_1, action) for x in games),
+            return_exceptions=True,
+        )
+
+        errors = [
+            x for x in results
+            if isinstance(x, exceptions.InvalidRequestException)
+        ]
+        assert len(errors) == 1
+
+        updated_game = await GameOrm.get(id=game.id)
+        expected = game.next_message_id + 1
+        actual = updated_game.next_message_id
+        assert expected == actual
+
     async def test_next_round_changes_at_round_end(
         self,
         game_started_with_team_1,
@@ -0,0 +1,76 @@
+import pytest
+
+from jeopardy import progress
+from jeopardy.models.action import ActionType
+from jeopardy.models.action import ChoiceOrm
+from jeopardy.models.game import RoundOrm
+
+
+pytestmark = pytest.mark.asyncio
+
+
+class TestLoad:
+    async def test_rebuilds_uncounted_round(
+        self, single_round, chosen_tile_1, tile_2
+    ):
+        actual = await progress.load(single_round)
+        expected = {"num_tiles": 2, "num_choices": 1, "num_responses": 0}
+        assert expected == actual
+
+        stored = await RoundOrm.get(id=single_round.id)
+        assert 2 == stored.num_tiles
+        assert 1 == stored.num_choices
+
+    async def test_reads_counted_round_without_rebuilding(
+        self, single_round, tile_1, tile_2
+    ):
+        await progress.load(single_round)
+        await RoundOrm.filter(id=single_round.id).update(num_choices=2)
+
+        actual = await progress.load(single_round)
+        assert 2 == actual["num_choices"]
+
+
+class TestRecord:
+    async def test_counts_choice_towards_counted_round(
+        self, game, single_round, team_1, player_1, tile_1
+    ):
+        await progress.load(single_round)
+        await ChoiceOrm.create(
+            game=game, tile=tile_1, team=team_1, user=player_1
+        )
+        await progress.record(single_round, ActionType.CHOICE)
+
+        actual = await progress.load(single_round)
+        assert 1 == actual["num_choices"]
+        assert await progress.is_consistent(single_round)
+
+    async def test_leaves_uncounted_round_to_be_rebuilt(
+        self, single_round, chosen_tile_1
+    ):
+        await progress.record(single_round, ActionType.CHOICE)
+
+        stored = await RoundOrm.get(id=single_round.id)
+        assert stored.num_choices is None
+
+    async def test_ignores_actions_that_are_not_counted(
+        self, single_round, tile_1
+    ):
+        await progress.load(single_round)
+        await progress.record(single_round, ActionType.BUZZ)
+
+        actual = await progress.load(single_round)
+        expected = {"num_tiles": 1, "num_choices": 0, "num_responses": 0}
+        assert expected == actual
+
+
+class TestIsConsistent:
+    async def test_detects_and_rebuilds_drifted_counters(
+        self, single_round, chosen_tile_1
+    ):
+        await progress.load(single_round)
+        await RoundOrm.filter(id=single_round.id).update(num_choices=0)
+        assert not await progress.is_consistent(single_round)
+
+        await progress.rebuild(single_round)
+        assert await progress.is_consistent(single_round)
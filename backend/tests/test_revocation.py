@@ -0,0 +1,73 @@
+from datetime import datetime
+from datetime import timedelta
+from unittest.mock import AsyncMock
+from unittest.mock import patch
+
+import pytest
+
+from jeopardy.models.token import UserTokenOrm
+from jeopardy.revocation import RevocationList
+
+
+pytestmark = pytest.mark.asyncio
+
+
+class TestRevocationList:
+    async def test_revoked_token_is_rejected_immediately(
+        self, anonymous_user
+    ):
+        revocations = RevocationList()
+        await revocations.revoke("test-revoke-now", anonymous_user.id, 60)
+        assert revocations.is_revoked("test-revoke-now")
+        assert not revocations.is_revoked("test-not-revoked")
+        assert not revocations.is_revoked(None)
+
+    async def test_refresh_picks_up_tokens_revoked_elsewhere(
+        self, anonymous_user
+    ):
+        await RevocationList().revoke(
+            "test-revoke-elsewhere", anonymous_user.id, 60
+        )
+
+        revocations = RevocationList()
+        assert not revocations.is_revoked("test-revoke-elsewhere")
+        await revocations.refresh()
+        assert revocations.is_revoked("test-revoke-elsewhere")
+
+    async def test_refresh_drops_revocations_older_than_tokens_live(
+        self, anonymous_user
+    ):
+        token = await UserTokenOrm.create(
+            value="test-revoke-old", user=anonymous_user, is_active=False
+        )
+        long_ago = datetime.utcnow() - timedelta(hours=2)
+        await UserTokenOrm.filter(id=token.id).update(created_ts=long_ago)
+
+        revocations = RevocationList(max_age=3600)
+        await revocations.refresh()
+        assert not revocations.is_revoked("test-revoke-old")
+        assert not await UserTokenOrm.exists(value="test-revoke-old")
+
+    async def test_token_revoked_without_user(self, database):
+        revocations = RevocationList()
+        await revocations.revoke("test-revoke-guest", None, 60)
+        assert revocations.is_revoked("test-revoke-guest")
+
+        token = await UserTokenOrm.get(value="test-revoke-guest")
+        assert token.user_id is None
+
+    async def test_refresh_keeps_tokens_revoked_while_loading(self):
+        revocations = RevocationList()
+
+        async def revoke_during_query():
+            await revocations.revoke("test-revoke-during", None, 60)
+            return []
+
+        with patch("jeopardy.revocation.UserTokenOrm") as mock_tokens:
+            mock_tokens.get_or_create = AsyncMock()
+            tokens = mock_tokens.filter.return_value
+            tokens.values_list.return_value = revoke_during_query()
+            tokens.delete = AsyncMock()
+            await revocations.refresh()
+
+        assert revocations.is_revoked("test-revoke-during")
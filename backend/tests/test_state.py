@@ -1,6 +1,22 @@
+import json
+from types import SimpleNamespace
+from unittest.mock import patch
+
 import pytest
 
 import jeopardy.state as state
+from jeopardy.models.game import GameStatus
+from jeopardy.models.game import RoundClass
+from jeopardy.models.reveals import BoardLevel
+from jeopardy.models.reveals import BoardLevelDetail
+from jeopardy.models.reveals import RoundRevealOrm
+from jeopardy.models.state import GameStateOrm
+from jeopardy.schema.state import Audience
+
+from legacy_state import board_content
+from legacy_state import board_rows
+from legacy_state import legacy_full
+from legacy_state import legacy_round
 
 
 pytestmark = pytest.mark.asyncio
@@ -18,3 +34,198 @@ class TestFull:
     ):
         game = game_started_with_team_1
         await state.current(game)
+
+    async def test_tiles_sorted_by_ordinal(
+        self, game_started_with_team_1, round_, tile_1, tile_2
+    ):
+        game = game_started_with_team_1
+        category = (await state.full(game)).round_.board.categories[0]
+
+        actual = [tile.id for tile in category.tiles]
+        expected = [tile_1.id, tile_2.id]
+        assert expected == actual
+
+    async def test_team_players_included(
+        self, game_started_with_team_1, round_, tile, team_1, player_1
+    ):
+        game = game_started_with_team_1
+        teams = (await state.full(game)).teams
+
+        actual = [
+            player.username for team in teams if team.id == team_1.id
+            for player in team.players
+        ]
+        expected = [player_1.username]
+        assert expected == actual
+
+
+class TestCurrent:
+    async def test_snapshot_saved_when_missing(
+        self, game_started_with_team_1, round_, tile
+    ):
+        game = game_started_with_team_1
+        await state.current(game)
+
+        snapshot = await GameStateOrm.get(game_id=game.id)
+        assert snapshot.message_id == game.next_message_id
+
+    async def test_snapshot_served_when_fresh(
+        self, game_started_with_team_1, round_, tile
+    ):
+        game = game_started_with_team_1
+        await state.save(game)
+
+        with patch("jeopardy.state.full") as mock_full:
+            await state.current(game)
+            mock_full.assert_not_called()
+
+    async def test_snapshot_rebuilt_when_stale(
+        self, game_started_with_team_1, round_, tile
+    ):
+        game = game_started_with_team_1
+        await state.save(game)
+
+        game.next_message_id += 1
+        await game.save()
+        actual = (await state.current(game)).message_id
+
+        expected = game.next_message_id
+        assert expected == actual
+
+
+class TestCurrentById:
+    async def test_snapshot_served_when_fresh(
+        self, game_started_with_team_1, round_, tile
+    ):
+        game = game_started_with_team_1
+        expected = await state.save(game)
+
+        with patch("jeopardy.state.full") as mock_full:
+            actual = await state.current_by_id(game.id)
+            mock_full.assert_not_called()
+        assert expected == actual
+
+    async def test_snapshot_rebuilt_when_stale(
+        self, game_started_with_team_1, round_, tile
+    ):
+        game = game_started_with_team_1
+        await state.save(game)
+
+        game.next_message_id += 1
+        await game.save()
+        actual = (await state.current_by_id(game.id)).message_id
+
+        expected = game.next_message_id
+        assert expected == actual
+
+
+class TestViews:
+    async def test_trivia_hidden_until_revealed(
+        self, game_started_with_team_1, round_, tile
+    ):
+        game = game_started_with_team_1
+        await RoundRevealOrm.create(
+            round_=round_,
+            level=BoardLevel.TILE,
+            level_id=tile.id,
+            detail=BoardLevelDetail.ANSWER,
+        )
+        views = await state.save_views(game)
+
+        for audience in (Audience.PLAYER, Audience.SPECTATOR):
+            board = views[audience].state["round_"]["board"]
+            actual = board["categories"][0]["tiles"][0]
+            assert "Test answer" == actual["answer"]
+            assert actual["question"] is None
+
+        actual = views[Audience.HOST].state["round_"]["board"]["categories"]
+        assert "Test question?" == actual[0]["tiles"][0]["question"]
+
+    async def test_views_served_from_cache(
+        self, game_started_with_team_1, round_, tile
+    ):
+        game = game_started_with_team_1
+        expected = (await state.save_views(game))[Audience.HOST]
+
+        with patch("jeopardy.state.GameStateOrm.get_or_none") as mock_get:
+            actual = await state.current(game, Audience.HOST)
+            mock_get.assert_not_called()
+        assert expected == actual
+
+
+class TestRedact:
+    def test_hides_unrevealed_trivia_without_changing_state(self):
+        tile = {"id": 1, "answer": "A", "question": "Q?", "points": 200}
+        game_state = {
+            "round_": {
+                "board": {"categories": [{"id": 1, "tiles": [tile]}]},
+            },
+        }
+        reveals = frozenset({(1, BoardLevelDetail.ANSWER)})
+
+        actual = state.redact(game_state, reveals)
+
+        expected_tile = {**tile, "question": None}
+        assert [expected_tile] == (
+            actual["round_"]["board"]["categories"][0]["tiles"]
+        )
+        assert "Q?" == tile["question"]
+
+    def test_state_without_round_unchanged(self):
+        game_state = {"round_": None}
+        assert game_state == state.redact(game_state, frozenset())
+
+
+class TestRender:
+    def test_display_level_per_audience(self):
+        full_state = {"display": {"level": "game", "id": None}}
+        partial_state = {"display": {"level": "game", "id": None}}
+
+        views = state.render(full_state, partial_state)
+
+        assert "team" == views[Audience.HOST]["display"]["level"]
+        assert "team" == views[Audience.PLAYER]["display"]["level"]
+        assert "game" == views[Audience.SPECTATOR]["display"]["level"]
+
+
+class TestAssemble:
+    def test_same_state_as_validated_models(self):
+        game = SimpleNamespace(
+            code="ABCD",
+            next_message_id=7,
+            next_chooser_id=2,
+            status=GameStatus.STARTED,
+        )
+        teams = [
+            SimpleNamespace(id=1, name="Team Elf", players=[
+                SimpleNamespace(id=1, username="elf"),
+            ]),
+            SimpleNamespace(id=2, name="Team Ogre", players=[]),
+        ]
+        rows = board_rows(class_=RoundClass.DOUBLE)
+
+        expected = legacy_full(game, teams, legacy_round(rows))
+        actual = state.assemble(game, teams, board_content(rows))
+        assert json.loads(expected.json()) == json.loads(actual.json())
+
+    def test_game_without_round(self):
+        game = SimpleNamespace(
+            code="ABCD",
+            next_message_id=0,
+            next_chooser_id=None,
+            status=GameStatus.JOINABLE,
+        )
+
+        actual = state.assemble(game, [], None)
+
+        assert actual.round_ is None
+        assert actual.team_that_chooses is None
+
+
+class TestMessageId:
+    async def test_looks_up_latest_message_id(self, game_started_with_team_1):
+        game = game_started_with_team_1
+        assert game.next_message_id == await state.message_id(game.id)
+
+    async def test_missing_game_has_no_message_id(self, game):
+        assert await state.message_id(game.id + 1000) is None
@@ -0,0 +1,30 @@
+"""
+Add game states
+"""
+from yoyo import step
+
+
+__depends__ = {'20200804_01_D7nuU-update-state'}
+
+
+add_game_states = """
+CREATE TABLE game_states(
+    id BIGINT NOT NULL PRIMARY KEY AUTO_INCREMENT,
+    created_ts DATETIME(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+    updated_ts DATETIME(6) NOT NULL  DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),
+    game_id BIGINT NOT NULL,
+    message_id BIGINT,
+    full TEXT,
+    partial TEXT,
+    CONSTRAINT fk_game_state FOREIGN KEY (game_id) REFERENCES games (id) ON DELETE CASCADE,
+    UNIQUE KEY unique_game_state (game_id)
+)
+"""
+
+
+drop_game_states = "DROP TABLE game_states"
+
+
+steps = [
+    step(add_game_states, drop_game_states),
+]
@@ -0,0 +1,28 @@
+"""
+Add round progress
+"""
+from yoyo import step
+
+
+__depends__ = {'20261018_01_Hq3dN-add-game-states'}
+
+
+add_round_progress = """
+ALTER TABLE rounds
+ ADD COLUMN num_tiles INT(11),
+ ADD COLUMN num_choices INT(11),
+ ADD COLUMN num_responses INT(11)
+"""
+
+
+drop_round_progress = """
+ALTER TABLE rounds
+DROP COLUMN num_tiles,
+DROP COLUMN num_choices,
+DROP COLUMN num_responses
+"""
+
+
+steps = [
+    step(add_round_progress, drop_round_progress),
+]
@@ -0,0 +1,38 @@
+"""
+Make game code recyclable
+
+Finished and abandoned games give up their code so that it can be handed out
+to a new game.
+"""
+from yoyo import step
+
+
+__depends__ = {'20261018_02_Vx7aL-add-round-progress'}
+
+
+make_code_nullable = """
+ALTER TABLE games
+MODIFY COLUMN code VARCHAR(4) NULL
+"""
+
+
+# Games that gave up their code get a placeholder built from their id. Live
+# codes are letters only, so placeholders with a digit can't collide with them.
+#
+# Only ids below 36^4 (1,679,616) fit in four base 36 digits. Past that the
+# placeholder is too long for the column and, in MySQL's default strict mode,
+# the update fails rather than truncating it into what could be a live code.
+# Rolling back then needs those games deleted, or given codes, by hand first.
+make_code_not_null = """
+UPDATE games
+   SET code = LPAD(CONV(id, 10, 36), 4, '0')
+ WHERE code IS NULL;
+
+ALTER TABLE games
+MODIFY COLUMN code VARCHAR(4) NOT NULL
+"""
+
+
+steps = [
+    step(make_code_nullable, make_code_not_null),
+]
@@ -0,0 +1,29 @@
+"""
+Add guest id
+
+Guests sign in without a user. Their user is created the first time they
+need one, and is found again by the guest id in their token.
+"""
+from yoyo import step
+
+
+__depends__ = {'20261018_03_Pc4Rw-make-game-code-recyclable'}
+
+
+add_guest_id = """
+ALTER TABLE user_metadata_anonymous
+ ADD COLUMN guest_id VARCHAR(32),
+ ADD UNIQUE KEY unique_guest_id (guest_id)
+"""
+
+
+drop_guest_id = """
+ALTER TABLE user_metadata_anonymous
+DROP KEY unique_guest_id,
+DROP COLUMN guest_id
+"""
+
+
+steps = [
+    step(add_guest_id, drop_guest_id),
+]
@@ -0,0 +1,29 @@
+"""
+Add unique google user
+
+Each Google account has at most one user, so that concurrent logins for the
+same account can't create two.
+"""
+from yoyo import step
+
+
+__depends__ = {'20261018_04_Gs8Kt-add-guest-id'}
+
+
+add_unique_google_user = """
+ALTER TABLE users
+ ADD UNIQUE KEY unique_google_metadata (google_metadata_id)
+"""
+
+
+# The foreign key needs an index once the unique key is gone
+drop_unique_google_user = """
+ALTER TABLE users
+ ADD INDEX fk_user_google_metadata (google_metadata_id),
+DROP INDEX unique_google_metadata
+"""
+
+
+steps = [
+    step(add_unique_google_user, drop_unique_google_user),
+]
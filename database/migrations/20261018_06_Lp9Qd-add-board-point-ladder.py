@@ -0,0 +1,24 @@
+"""
+Add board point ladder
+"""
+from yoyo import step
+
+
+__depends__ = {'20261018_05_Ue2Mz-add-unique-google-user'}
+
+
+add_point_ladder = """
+ALTER TABLE boards
+ ADD COLUMN point_ladder TEXT
+"""
+
+
+drop_point_ladder = """
+ALTER TABLE boards
+DROP COLUMN point_ladder
+"""
+
+
+steps = [
+    step(add_point_ladder, drop_point_ladder),
+]
@@ -0,0 +1,32 @@
+"""
+Make token user optional
+
+Revoked tokens are identified by their id alone. Guests have no user until
+they need one, so their revoked tokens are stored without a user.
+"""
+from yoyo import step
+
+
+__depends__ = {'20261018_06_Lp9Qd-add-board-point-ladder'}
+
+
+make_user_nullable = """
+ALTER TABLE user_tokens
+MODIFY COLUMN user_id BIGINT NULL
+"""
+
+
+# Guest tokens only live for an hour, so dropping their revocations just lets
+# the few that are still unexpired be used again
+make_user_not_null = """
+DELETE FROM user_tokens
+ WHERE user_id IS NULL;
+
+ALTER TABLE user_tokens
+MODIFY COLUMN user_id BIGINT NOT NULL
+"""
+
+
+steps = [
+    step(make_user_nullable, make_user_not_null),
+]
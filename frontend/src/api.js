@@ -27,5 +27,13 @@ export const api = {
       }
     }
     socket.send(JSON.stringify(message));
+  },
+  syncGame(socket) {
+    var message = {
+      "action": {
+        "type": "sync"
+      }
+    }
+    socket.send(JSON.stringify(message));
   }
 }
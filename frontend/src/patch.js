@@ -0,0 +1,33 @@
+function unescapeKey(key) {
+  return key.replace(/~1/g, "/").replace(/~0/g, "~");
+}
+
+// Apply JSON patch operations ("add", "remove", "replace") sent by the
+// backend to a copy of the document.
+export function applyPatch(document, operations) {
+  var result = JSON.parse(JSON.stringify(document));
+  for (const operation of operations) {
+    const keys = operation.path.split("/").slice(1).map(unescapeKey);
+    if (keys.length == 0) {
+      result = operation.value;
+      continue;
+    }
+
+    var parent = result;
+    for (const key of keys.slice(0, -1)) {
+      parent = parent[key];
+    }
+
+    const key = keys[keys.length - 1];
+    if (Array.isArray(parent) && operation.op == "add") {
+      parent.splice(Number(key), 0, operation.value);
+    } else if (Array.isArray(parent) && operation.op == "remove") {
+      parent.splice(Number(key), 1);
+    } else if (operation.op == "remove") {
+      delete parent[key];
+    } else {
+      parent[key] = operation.value;
+    }
+  }
+  return result;
+}